@@ -300,3 +300,34 @@ def test_conv():
     assert(0x3d==0x7d&0x3f)
     assert(0x3e==0x7e&0x3f)
     assert(0x3f==0x7f&0x3f)
+
+def test_bit6_table():
+    # test the bit6 lookup table against GA23-0059-4 Figure D-1
+    # for every byte (bits 0 and 1 are ignored)
+    codes = bytes.fromhex("40c1c2c3c4c5c6c7c8c94a4b4c4d4e4f"
+                          "50d1d2d3d4d5d6d7d8d95a5b5c5d5e5f"
+                          "6061e2e3e4e5e6e7e8e96a6b6c6d6e6f"
+                          "f0f1f2f3f4f5f6f7f8f97a7b7c7d7e7f")
+    assert(tnz._BIT6_TABLE==codes*4)
+
+def test_group_addrs():
+    z = tnz.Tnz()
+    z.plane_eh[5:9] = b"\x0a" * 4
+    z.plane_fg[7:20] = b"\xf2" * 13
+    z.plane_fg[9] = 0x0a
+    assert list(z.group_addrs(0, 0))[:6] == [(0, 5), (5, 7), (7, 9),
+                                             (9, 10), (10, 20), (20, 80)]
+
+def test_ucba():
+    dst = bytearray(8)
+    tnz.Tnz.ucba(dst, 6, b"\x01\x02\x03\x04", 1)
+    assert dst == bytearray(b"\x04\x00\x00\x00\x00\x00\x02\x03")
+    tnz.Tnz.ucba(dst, 7, [5, 6, 7])
+    assert dst == bytearray(b"\x06\x07\x00\x00\x00\x00\x02\x05")
+
+def test_rcba():
+    assert tnz.Tnz.rcba(b"abcdef", 1, 3) == b"bc"
+    assert tnz.Tnz.rcba(b"abcdef", 4, 2) == b"efab"
+    assert tnz.Tnz.rcba(bytearray(b"abcdef"), 4, 2) == b"efab"
+    assert tnz.Tnz.rcba("abcdef", 4, 2) == "efab"
+    assert tnz.Tnz.rcba([1, 2, 3, 4, 5, 6], 4, 2) == [5, 6, 1, 2]
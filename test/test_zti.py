@@ -0,0 +1,30 @@
+import io
+
+from tnz import zti
+
+def test_receive_ascii():
+    # compare chunked conversion with converting all data at once
+    # CRLF split across chunks, CRCRLF, trailing CR x1A, lone x1A
+    for data in (b"ab\r\ncd\r\n",
+                 b"a\r\r\nb\r\r\n",
+                 b"ab\r\x1a",
+                 b"\x1a",
+                 b"ab\r\ncd\x1a",
+                 b"a\x1ab\x1a\x1a"):
+        bstr = data
+        if bstr.endswith(b"\x1a"):
+            bstr = bstr[:-1]
+
+        expect = bstr.replace(b"\r\n", b"\n").decode("iso8859-1")
+        for size in range(1, len(data) + 2):
+            file2 = io.StringIO()
+            zti.Zti._receive_ascii(io.BytesIO(data), file2, size)
+            assert file2.getvalue() == expect, (data, size)
+
+    # trailing CR then a lone x1A chunk
+    file2 = io.StringIO()
+    zti.Zti._receive_ascii(io.BytesIO(b"ab\r\x1a"), file2, 3)
+    assert file2.getvalue() == "ab\r"
+    file2 = io.StringIO()
+    zti.Zti._receive_ascii(io.BytesIO(b"ab\r\ncd\x1a"), file2, 3)
+    assert file2.getvalue() == "ab\ncd"
@@ -253,23 +253,9 @@ class Ati():
         if unam == "SESSION":
             return self.__gv["SESSION"]
 
-        if unam == "SESSIONS":
-            return self.sessions
-
-        if unam == "DATETIME":
-            return self.datetime
-
-        if unam == "DATE":
-            return self.date
-
-        if unam == "TIME":
-            return self.time
-
-        if unam == "MILLIAGE":
-            return self.milliage
-
-        if unam == "AGE":
-            return self.age
+        prop = self.__getitem_props.get(unam)
+        if prop:
+            return prop.fget(self)
 
         rval = self.__uv.get(unam, None)
 
@@ -3536,6 +3522,15 @@ class Ati():
     __ati_stack = []
     __GLOBAL = {}  # use as value in __uv to indicate to look in __gv
 
+    # variables that __getitem__ gets from a property
+    __getitem_props = {"SESSIONS": sessions,
+                       "DATETIME": datetime,
+                       "DATE": date,
+                       "TIME": time,
+                       "MILLIAGE": milliage,
+                       "AGE": age,
+                       }
+
 
 class _AtiConst():
     def __init__(self, name):
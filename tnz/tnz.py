@@ -19,13 +19,16 @@ SPDX-License-Identifier: Apache-2.0
 """
 
 import asyncio
+import codecs
 import enum
 import json
 import logging
 import os
 import platform
 import re
+import socket
 import ssl
+import struct
 import sys
 from . import __version__
 
@@ -98,7 +101,7 @@ class Tnz:
 
         self.__secure = False
         self.__cert_verified = False
-        self.__start_tls_hostname = None
+        self.__start_tls_host = None
         self.__start_tls_completed = False
         self.__host_verified = False
         self._event = None
@@ -131,6 +134,7 @@ class Tnz:
         self.__ddmopen = False
         self.__ddmrecnum = 0
         self.__ddmascii = False
+        self.__ddm_decode = None
         self.__ddmmsg = None
         self.__ddmerr = None
         self.lastcmd = None
@@ -161,6 +165,7 @@ class Tnz:
         # that can be done to get 32767 to work?
         self._limin = 32639
         self._limout = 32767
+        self.__query_reply_cache = None  # (key, rec)
 
         self._sendbuf = []
         self.local_do = []
@@ -207,13 +212,8 @@ class Tnz:
         self.capable_color = False
         self.__extended_color_mode = False
 
-        buffer_size = self.buffer_size
-        self.plane_dc = bytearray(buffer_size)  # data characters
-        self.plane_fa = bytearray(buffer_size)  # field attributes
-        self.plane_eh = bytearray(buffer_size)  # extended hilite
-        self.plane_cs = bytearray(buffer_size)  # character set
-        self.plane_fg = bytearray(buffer_size)  # foreground color
-        self.plane_bg = bytearray(buffer_size)  # background color
+        self.__zeros = None
+        self.__new_planes()
 
         self.__pt_erase = False
         self.__proc_eh = 0  # extended highlighting
@@ -324,11 +324,11 @@ class Tnz:
 
         value = address
         if not self.addr16bit and self.buffer_size <= 4095:
-            _bit6 = bit6
+            bit6_table = _BIT6_TABLE
             high_6bits, low_6bits = divmod(address, 64)
-            value = _bit6(low_6bits) + 256 * _bit6(high_6bits)
+            value = bit6_table[low_6bits] + 256 * bit6_table[high_6bits]
 
-        return value.to_bytes(2, byteorder="big")
+        return self.__u16.pack(value)
 
     def attn(self):
         """Send 3270 ATTN
@@ -343,13 +343,7 @@ class Tnz:
         """
         self.__extended_color_mode = False
 
-        buffer_size = self.buffer_size
-        self.plane_dc = bytearray(buffer_size)  # data characters
-        self.plane_fa = bytearray(buffer_size)  # field attributes
-        self.plane_eh = bytearray(buffer_size)  # extended hilite
-        self.plane_cs = bytearray(buffer_size)  # character set
-        self.plane_fg = bytearray(buffer_size)  # foreground color
-        self.plane_bg = bytearray(buffer_size)  # background color
+        self.__new_planes()
 
         self.curadd = 0  # cursor address
 
@@ -379,11 +373,7 @@ class Tnz:
         if host is None:
             host = "127.0.0.1"  # default host
         elif not secure:  # if might need hostname later for start_tls
-            import socket
-            try:
-                self.__start_tls_hostname = socket.getfqdn(host)
-            except socket.gaierror:
-                pass
+            self.__start_tls_host = host
 
         if port is None:
             if secure is False:
@@ -741,11 +731,8 @@ class Tnz:
         Return True or False to indicate if all fields are
         unprotected
         """
-        for _, fattr in self.fields():
-            if self.is_protected_attr(fattr):
-                return False
-
-        return True
+        # any protected field attribute is marked with 2
+        return b"\x02" not in self.plane_fa.translate(_TAB_MARKS)
 
     def iterow(self, saddr, eaddr):
         """
@@ -828,7 +815,7 @@ class Tnz:
         self.__log_debug("  backtab")
 
         addr = self.curadd
-        faddr, fav = self.field(addr)
+        faddr, _ = self.field(addr)
         if faddr < 0:
             self.curadd = 0
             return
@@ -837,24 +824,22 @@ class Tnz:
         addrm1 = (addr-1) % buffer_size
         if faddr in (addr, addrm1):
             addr = (faddr-1) % buffer_size
-            faddr, fav = self.field(addr)
+            faddr, _ = self.field(addr)
+
+        # Search backward, starting with the field at faddr, for a
+        # character with an unprotected field attribute in the
+        # previous address. See __tab for the marks layout.
+        marks = self.plane_fa.translate(_TAB_MARKS)
+        marks = marks[-1:] + marks
+        rfind = marks.rfind
+        addr = (faddr+1) % buffer_size
+        addr1 = rfind(b"\x01\x00", 0, addr + 2)
+        if addr1 < 0:
+            addr1 = rfind(b"\x01\x00", addr + 1)
+            if addr1 < 0:
+                addr1 = 0
 
-        fa1 = faddr
-        plane_fa = self.plane_fa
-        field = self.field
-        while True:
-            if not fav & 0x20:  # if unprotected
-                addr = (faddr+1) % buffer_size
-                fav = plane_fa[addr]
-                if fav == 0:
-                    self.curadd = addr
-                    return
-
-            faddr = (faddr-1) % buffer_size
-            faddr, fav = field(faddr)
-            if faddr == fa1:
-                self.curadd = 0
-                return
+        self.curadd = addr1
 
     def key_curdown(self, zti=None):
         """Process cursor down key.
@@ -938,7 +923,7 @@ class Tnz:
 
         else:  # else faddr is field address
             addr3, _ = self.next_field(addr0)
-            self.plane_fa[faddr] = bit6(fattr | 1)  # Set MDT
+            self.plane_fa[faddr] = _BIT6_TABLE[fattr | 1]  # Set MDT
 
         self.__log_debug("  delete %d %d %d", faddr, addr0, addr3)
         buffer_size = self.buffer_size
@@ -1025,7 +1010,7 @@ class Tnz:
             addr2 = addr0
         else:
             addr2, _ = self.next_field(addr0)
-            fattr = bit6(fattr | 1)  # Set MDT (Modified Data Tag)
+            fattr = _BIT6_TABLE[fattr | 1]  # Set MDT
             self.plane_fa[faddr] = fattr
 
         self.__erase(addr0, addr2)
@@ -1506,17 +1491,16 @@ class Tnz:
         plane_dc = self.plane_dc
         plane_cs = self.plane_cs
         codec_info = self.codec_info
-        trans_dc_to_c = self.__trans_dc_to_c
+        decode_dc = self.__decode_dc
         strl = []
         addr0 = saddr
         for addr1 in self.__iterbs_addr(plane_cs, saddr, eaddr):
             bytes1 = rcba(plane_dc, addr0, addr1)
-            bytes1 = bytes1.translate(trans_dc_to_c)
             cii = plane_cs[addr0]
-            strl.append(codec_info[cii].decode(bytes1)[0])
+            strl.append(decode_dc(bytes1, codec_info[cii]))
             addr0 = addr1
 
-        str1 = "".join(strl).translate(self.__trans_ords)
+        str1 = "".join(strl)
         if not rstrip:
             return str1
 
@@ -1555,7 +1539,7 @@ class Tnz:
         self.bytes_sent += len(data)
         self._sendbuf.clear()
 
-    def send_3270_data(self, value):
+    def send_3270_data(self, value, buffer=False):
         """
         Send input byte array as a 3270-DATA record to the host.
         This method will escape IAC bytes and send EOR after the
@@ -1568,7 +1552,8 @@ class Tnz:
 
         append(value)
         append(b"\xff\xef")  # IAC EOR
-        self.send()
+        if not buffer:
+            self.send()
 
     def send_aid(self, aid, short=None):
         """
@@ -1854,19 +1839,14 @@ class Tnz:
         self.__next_get()
 
         data = self.__indsisf
-        rec = b"\x88"  # SF (Structured Field AID)
         if not data:
-            isf = b"\xd0\x46\x08"  # D04608 Get Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x22\x00"  # Error Code Get Past End of File
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
+            rec = self.__ddm_get_eof
             self.__log_debug("DDM Get Past End Of File send")
             self.__inds_rm = None
         else:
             self.__log_debug("DDM Data for Get send")
             self.__log_debug("SF: %r", data)
-            rec += data
+            rec = b"\x88" + data  # SF (Structured Field AID)
             self.__inds_rm = rec
 
         self.send_3270_data(rec)
@@ -2104,15 +2084,14 @@ class Tnz:
             else:
                 raise TnzError(f"DATA-TYPE {data_type} not implemented")
 
-        command_hex = hex(b_str[0])
-        rtn_name = "_process_command_" + command_hex
+        rtn_name = self.__command_names[b_str[0]]
         rtn = getattr(self, rtn_name, self._process_command_unknown)
         rtn(b_str, 0, len(b_str), zti=zti)
 
         if response_flag == 2:
             rsp = (b"\x02\x00" +  # DATA-TYPE=RESPONSE REQUEST-FLAG=0
                    b"\x00" +  # success (use x01 for error)
-                   seq_number.to_bytes(2, byteorder="big") +
+                   self.__u16.pack(seq_number) +
                    b"\x00")  # successful (Device End)
             self.__log_debug("Sending TN3270E response: %r", rsp)
             self.send_rec(rsp)
@@ -2402,25 +2381,31 @@ class Tnz:
             raise TnzError("WSF needs 4 bytes, got {cmnd_len}")
 
         from_bytes = int.from_bytes
+        wsf_names = self.__wsf_names
         i = start + 1
-        while i < stop:
-            sfl = from_bytes(b_str[i:(i+2)], "big")  # length
-            if sfl == 0:
-                sfl = stop - i
+        try:
+            while i < stop:
+                sfl = from_bytes(b_str[i:(i+2)], "big")  # length
+                if sfl == 0:
+                    sfl = stop - i
 
-            if sfl < 3:
-                raise TnzError(f"Bad structured field length: {sfl}")
+                if sfl < 3:
+                    raise TnzError(
+                        f"Bad structured field length: {sfl}")
 
-            if i + sfl > stop:
-                self.__log_error("sfl=%s", sfl)
-                self.__log_error("sf=%s", b_str[i:stop].hex())
-                raise TnzError("WSF len and data inconsistent")
+                if i + sfl > stop:
+                    self.__log_error("sfl=%s", sfl)
+                    self.__log_error("sf=%s", b_str[i:stop].hex())
+                    raise TnzError("WSF len and data inconsistent")
 
-            wsf_hex = hex(b_str[i+2])
-            rtn_name = "_process_wsf_" + wsf_hex
-            rtn = getattr(self, rtn_name, self._process_wsf_unknown)
-            rtn(b_str, i, i+sfl, zti=zti)
-            i += sfl
+                rtn_name = wsf_names[b_str[i+2]]
+                rtn = getattr(self, rtn_name, self._process_wsf_unknown)
+                rtn(b_str, i, i+sfl, zti=zti)
+                i += sfl
+
+        finally:
+            if self._sendbuf:
+                self.send()  # any buffered data (e.g. DDM replies)
 
     def _process_command_0xf5(self, b_str, start, stop, zti=None):
         """
@@ -2513,12 +2498,14 @@ class Tnz:
         if zti:
             zti.write_data_prep(self, saddr, datalen)
 
-        self.ucba(self.plane_dc, saddr, data, begidx, endidx)
-        self.ucba(self.plane_fa, saddr, b"\x00"*datalen)
-        self.ucba(self.plane_eh, saddr, [self.__proc_eh]*datalen)
-        self.ucba(self.plane_cs, saddr, [self.__proc_cs]*datalen)
-        self.ucba(self.plane_fg, saddr, [self.__proc_fg]*datalen)
-        self.ucba(self.plane_bg, saddr, [self.__proc_bg]*datalen)
+        ucba = self.ucba
+        fill = self.__fill
+        ucba(self.plane_dc, saddr, data, begidx, endidx)
+        ucba(self.plane_fa, saddr, self.__zeros, 0, datalen)
+        ucba(self.plane_eh, saddr, fill(self.__proc_eh, datalen))
+        ucba(self.plane_cs, saddr, fill(self.__proc_cs, datalen))
+        ucba(self.plane_fg, saddr, fill(self.__proc_fg, datalen))
+        ucba(self.plane_bg, saddr, fill(self.__proc_bg, datalen))
 
         oldadd = self.bufadd
         self.bufadd = (self.bufadd + datalen) % self.buffer_size
@@ -2588,25 +2575,14 @@ class Tnz:
             ft_bytes = b_str[start+34:(start+41)]
         else:  # ?
             # Open Failed Exception
-            rec = b"\x88"  # SF (Structured Field AID)
-            isf = b"\xd0\x00\x08"  # D00008 Open Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x01\x00"  # Open Failed Exception
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
             self.__log_debug("DDM Open Failed Exception send")
-            self.send_3270_data(rec)
+            self.send_3270_data(self.__ddm_open_error, buffer=True)
             self.__log_error("DDM Open unexpected")
             return
 
         ft_str = ft_bytes.decode("iso8859-1", errors="replace")
         self.__log_debug("ft: %s", ft_str)
 
-        rec = b"\x88"  # SF (Structured Field AID)
-        isf = b"\xd0\x00\x09"  # D00009 Open Acknowledgement
-        isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-        rec += isf
-
         indstr = self.__indstr
         if not self.__indsfile and indstr:
             self.__indstr = ""
@@ -2640,14 +2616,9 @@ class Tnz:
                 except OSError:
                     self.__indstemp = False
                     # Open Request Error
-                    rec = b"\x88"  # SF (Structured Field AID)
-                    isf = b"\xd0\x00\x08"  # D00008 Open Error
-                    isf += b"\x69\x04"  # Error Code Header
-                    isf += b"\x01\x00"  # Open Failed Exception
-                    isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-                    rec += isf
                     self.__log_debug("DDM Open Failed Exception send")
-                    self.send_3270_data(rec)
+                    self.send_3270_data(self.__ddm_open_error,
+                                        buffer=True)
                     self.__log_error("sf[14]=%r", b_str[start+14])
                     self.__log_error("DDM Open File failed")
                     return
@@ -2666,25 +2637,24 @@ class Tnz:
             ((not ddmupload and not self.ddmrecv) or
                 (ddmupload and not self.ddmsend))):  # unexpected
             # Open Request Error
-            rec = b"\x88"  # SF (Structured Field AID)
-            isf = b"\xd0\x00\x08"  # D00008 Open Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x01\x00"  # Open Failed Exception
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
             self.__log_debug("DDM Open Failed Exception send")
-            self.send_3270_data(rec)
+            self.send_3270_data(self.__ddm_open_error, buffer=True)
             self.__log_error("sf[14]=%r", b_str[start+14])
             self.__log_error("DDM Open unexpected")
             return
 
         self.__log_debug("DDM Open Ack send")
-        self.send_3270_data(rec)  # send ddm open acknowledgement
+        self.send_3270_data(self.__ddm_open_ack)
 
         oldupload = self.__ddmupload
         self.__ddmupload = ddmupload
         self.__ddmdata = (ft_str == "FT:DATA")
         self.__ddmascii = (ft_str != "FT:DATA")
+        if self.__ddmascii:
+            self.__ddm_decode = codecs.lookup("iso8859-1").decode
+        else:
+            self.__ddm_decode = self.codec_info[0].decode
+
         self.__ddmopen = True
         self.__ddmrecnum = 0
         self.__inds_rm = None
@@ -2734,14 +2704,9 @@ class Tnz:
 
         if not self.__indsfile or not self.__ddmopen:
             # Set Cursor Error
-            rec = b"\x88"  # SF (Structured Field AID)
-            isf = b"\xd0\x45\x08"  # D04508 Set Cursor Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x60\x00"  # Command Syntax Error
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
             self.__log_debug("DDM Set Cursor Syntax Error send")
-            self.send_3270_data(rec)
+            self.send_3270_data(self.__ddm_set_cursor_error,
+                                buffer=True)
             self.__log_error("DDM Set Cursor unexpected")
             return
 
@@ -2765,14 +2730,8 @@ class Tnz:
 
         if not self.__indsfile or not self.__ddmopen:
             # Get Request Error
-            rec = b"\x88"  # SF (Structured Field AID)
-            isf = b"\xd0\x46\x08"  # D04608 Get Request Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x60\x00"  # Command Syntax Error
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
             self.__log_debug("DDM Get Syntax Error send")
-            self.send_3270_data(rec)
+            self.send_3270_data(self.__ddm_get_error, buffer=True)
             self.__log_error("DDM Get unexpected")
             return
 
@@ -2781,19 +2740,14 @@ class Tnz:
             self.__log_error("sf=%r", b_str[start:stop])
 
         data = self.__indsisf
-        rec = b"\x88"  # SF (Structured Field AID)
         if not data:
-            isf = b"\xd0\x46\x08"  # D04608 Get Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x22\x00"  # Error Code Get Past End of File
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
+            rec = self.__ddm_get_eof
             self.__log_debug("DDM Get Past End Of File send")
             self.__inds_rm = None
         else:
             self.__log_debug("DDM Data for Get send")
             self.__log_debug("SF: %r", data)
-            rec += data
+            rec = b"\x88" + data  # SF (Structured Field AID)
             self.__inds_rm = rec
 
         self.send_3270_data(rec)
@@ -2819,14 +2773,8 @@ class Tnz:
 
         if not self.__ddmopen:
             # Insert Request Error
-            rec = b"\x88"  # SF (Structured Field AID)
-            isf = b"\xd0\x47\x08"  # D04708 Insert Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x60\x00"  # Command Syntax Error
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
             self.__log_debug("DDM Insert Syntax Error send")
-            self.send_3270_data(rec)
+            self.send_3270_data(self.__ddm_insert_error, buffer=True)
             self.__log_error("DDM insert unexpected")
 
     def _process_ddm_0xd04704(self, b_str, start, stop, zti=None):
@@ -2841,14 +2789,8 @@ class Tnz:
 
         if not self.__ddmopen:
             # Insert Request Error
-            rec = b"\x88"  # SF (Structured Field AID)
-            isf = b"\xd0\x47\x08"  # D04708 Insert Error
-            isf += b"\x69\x04"  # Error Code Header
-            isf += b"\x60\x00"  # Command Syntax Error
-            isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-            rec += isf
             self.__log_debug("DDM Data to Insert Syntax Error send")
-            self.send_3270_data(rec)
+            self.send_3270_data(self.__ddm_insert_error, buffer=True)
             self.__log_error("DDM Data To Insert unexpected")
             return
 
@@ -2861,7 +2803,7 @@ class Tnz:
         #         Data Length plus 5
         # 10:   = data
 
-        datalen = int.from_bytes(b_str[(start+8):(start+10)], "big")
+        datalen = self.__u16.unpack_from(b_str, start+8)[0]
         if datalen <= 5:
             # seems like this may happen when the host
             # does not like the limin or limout value
@@ -2874,11 +2816,7 @@ class Tnz:
 
         self.__log_debug("DDM Inserting %d byte(s)", len(data))
 
-        if self.__ddmascii:
-            data_str = data.decode("iso8859-1", errors="ignore")
-        else:
-            data_str = self.codec_info[0].decode(data,
-                                                 errors="ignore")[0]
+        data_str = self.__ddm_decode(data, "ignore")[0]
 
         if not self.__ddmdata:  # DDM MSG (not DATA)
             self.__log_debug("DDM MSG: %r", data_str)
@@ -2886,12 +2824,8 @@ class Tnz:
 
         self.__ddmrecnum += 1
 
-        rec = b"\x88"  # SF (Structured Field AID)
-        isf = b"\xd0\x47\x05"  # D04705 Data Acknowledgement
-        isf += b"\x63\x06"  # record number header
-        isf += self.__ddmrecnum.to_bytes(4, byteorder="big")
-        isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-        rec += isf
+        rec = (self.__ddm_data_ack +
+               self.__u32.pack(self.__ddmrecnum))
         self.__log_debug("DDM Data Ack send")
         self.send_3270_data(rec)
 
@@ -2915,9 +2849,7 @@ class Tnz:
                 # ascii and EBCDIC. And consider that
                 # EBCDIC translation often equates
                 # EBCDIC NL with unicode LF.
-                data = data.replace(b"\n", b"")
-                data = data.decode(self.__indsenc)
-                data = data.replace("\r", "\n")
+                data = self.__decode_crlf(data, self.__indsenc)
 
             if self.__indsfile:  # if have file for saving
                 self.__log_debug("ddm writing file")
@@ -2994,12 +2926,8 @@ class Tnz:
         self.__log_debug("DDM Close Request")
 
         # send close reply/acknowledgement
-        rec = b"\x88"  # SF (Structured Field AID)
-        isf = b"\xd0\x41\x09"  # D04109 Close Acknowledgement
-        isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-        rec += isf
         self.__log_debug("DDM Close Ack send")
-        self.send_3270_data(rec)
+        self.send_3270_data(self.__ddm_close_ack, buffer=True)
 
     def _process_ddm_unknown(self, b_str, start, stop, zti=None):
         ddm_req = b_str[(start+2):min((start+5), stop)]
@@ -3063,7 +2991,7 @@ class Tnz:
         Returns:
             The index after the last byte process by the order.
         """
-        rtn_name = "_process_order_" + hex(order[start])
+        rtn_name = self.__order_names[order[start]]
         rtn = getattr(self, rtn_name, self._process_order_unknown)
         return rtn(order, start, stop, zti=zti)
 
@@ -3093,57 +3021,6 @@ class Tnz:
         self.__log_debug(" Program Tab @ %r -> %r", oldadd, bufadd)
         return start + 1
 
-    def _process_order_0x8(self, order, start, stop, zti=None):
-        """Process Graphic Escape (GE) order.
-
-        Called by process_order.
-        """
-        order_len = stop - start
-        if order_len < 2:
-            raise TnzError(f"GE requires 2 bytes, got {order_len}")
-
-        self.__pt_erase = False
-        ge_byte = order[start+1]
-        addr1 = self.bufadd
-        self.__log_debug(" Graphic Escape 0x%02x @ %r", ge_byte, addr1)
-
-        if zti:
-            zti.write_data_prep(self, addr1, 1)
-
-        self.plane_dc[addr1] = ge_byte
-        self.plane_fa[addr1] = 0
-        self.plane_eh[addr1] = self.__proc_eh
-        self.plane_cs[addr1] = 0xf1
-        self.plane_fg[addr1] = self.__proc_fg
-        self.plane_bg[addr1] = self.__proc_bg
-
-        self.bufadd = (addr1+1) % self.buffer_size
-
-        if zti:
-            # Use force=True to indicate that the data that was
-            # just updated may have removed a field attribute. It
-            # also indicates that the update did not change the
-            # cursor.
-            zti.write_data(self, addr1, 1, force=True)
-
-        return start+2
-
-    def _process_order_0x11(self, order, start, stop, zti=None):
-        """Process Set Buffer Address (SBA) order.
-
-        Called by process_order.
-        """
-        order_len = stop - start
-        if order_len < 3:
-            raise TnzError(f"SBA requires 3 bytes, got {order_len}")
-
-        self.__pt_erase = False
-        newaddr = self.address(order[(start+1):(start+3)])
-        self.__log_debug(" Set Buffer Address %r", newaddr)
-        self.__check_address(newaddr)
-        self.bufadd = newaddr
-        return start+3
-
     def _process_order_0x12(self, order, start, stop, zti=None):
         """Process Erase Unprotected to Address (EUA) order.
 
@@ -3180,32 +3057,6 @@ class Tnz:
 
         return start+1
 
-    def _process_order_0x1d(self, order, start, stop, zti=None):
-        """Process Start Field (SF) order.
-
-        Called by process_order.
-        """
-        order_len = stop - start
-        if order_len < 2:
-            raise TnzError(f"SF requires 2 bytes, got {order_len}")
-
-        self.__pt_erase = False
-        fattr = order[start+1]
-        bufadd = self.bufadd
-        self.__log_debug(" Start Field Value=x%02x @ %r", fattr, bufadd)
-        self.plane_dc[bufadd] = 0
-        self.plane_fa[bufadd] = bit6(fattr)
-        self.plane_eh[bufadd] = 0
-        self.plane_cs[bufadd] = 0
-        self.plane_fg[bufadd] = 0
-        self.plane_bg[bufadd] = 0
-        self.bufadd = (bufadd+1) % self.buffer_size
-
-        if zti:
-            zti.field(self, bufadd)
-
-        return start+2
-
     def _process_order_0x28(self, order, start, stop, zti=None):
         """Process Set Attribute (SA) order.
 
@@ -3279,7 +3130,11 @@ class Tnz:
                                              order, start + 1, zti=zti)
         self.__log_debug(" Start Field Extended Value=%r @ %r",
                          pairs, bufadd)
-        self.bufadd = (bufadd+1) % self.buffer_size
+        addr1 = bufadd + 1
+        if addr1 == self.buffer_size:  # if wrap
+            addr1 = 0
+
+        self.bufadd = addr1
         if zti:
             zti.field(self, bufadd)
 
@@ -3303,7 +3158,11 @@ class Tnz:
                                          order, start + 1, zti=zti)
         self.__log_debug(" Modify Field=%r @ %r",
                          pairs, bufadd)
-        self.bufadd = (bufadd+1) % self.buffer_size
+        addr1 = bufadd + 1
+        if addr1 == self.buffer_size:  # if wrap
+            addr1 = 0
+
+        self.bufadd = addr1
         if zti:
             zti.field(self, bufadd)
 
@@ -3346,12 +3205,13 @@ class Tnz:
             zti.write_data_prep(self, bufadd, rlen)
 
         ucba = self.ucba
-        ucba(self.plane_dc, bufadd, bytes([data_byte]*rlen))
-        ucba(self.plane_fa, bufadd, b"\x00"*rlen)
-        ucba(self.plane_eh, bufadd, [self.__proc_eh]*rlen)
-        ucba(self.plane_cs, bufadd, bytes([cs_attr]*rlen))
-        ucba(self.plane_fg, bufadd, [self.__proc_fg]*rlen)
-        ucba(self.plane_bg, bufadd, [self.__proc_bg]*rlen)
+        fill = self.__fill
+        ucba(self.plane_dc, bufadd, bytes((data_byte,)) * rlen)
+        ucba(self.plane_fa, bufadd, self.__zeros, 0, rlen)
+        ucba(self.plane_eh, bufadd, fill(self.__proc_eh, rlen))
+        ucba(self.plane_cs, bufadd, fill(cs_attr, rlen))
+        ucba(self.plane_fg, bufadd, fill(self.__proc_fg, rlen))
+        ucba(self.plane_bg, bufadd, fill(self.__proc_bg, rlen))
 
         self.bufadd = stop_address
 
@@ -3369,6 +3229,10 @@ class Tnz:
 
     def _process_orders_data(self, b_str, start, end, zti=None):
         """Process a byte array of a stream of orders and data.
+
+        The most frequent orders (SBA, SF, and GE) are processed
+        only here, inline using local references to the planes. All
+        other orders are processed by _process_order.
         """
         self.bufadd = self.curadd
         self.__proc_eh = 0
@@ -3379,6 +3243,23 @@ class Tnz:
         patord = self.__patord
         process_data = self._process_data
         process_order = self._process_order
+        address = self.address
+        check_address = self.__check_address
+        log_debug = self.__log_debug
+        logger = self.__logger
+        if not logger:
+            self.__log_check()
+            logger = self.__logger
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        buffer_size = self.buffer_size
+        plane_dc = self.plane_dc
+        plane_fa = self.plane_fa
+        plane_eh = self.plane_eh
+        plane_cs = self.plane_cs
+        plane_fg = self.plane_fg
+        plane_bg = self.plane_bg
+        bit6_table = _BIT6_TABLE
         while start < end:
             pat = patord.search(b_str, start, end)
             if not pat:
@@ -3390,7 +3271,89 @@ class Tnz:
                 process_data(b_str, start, ordidx, zti=zti)
                 self.__pt_erase = True
 
-            start = process_order(b_str, ordidx, end, zti=zti)
+            order = b_str[ordidx]
+            if order == 0x11:  # SBA (Set Buffer Address)
+                order_len = end - ordidx
+                if order_len < 3:
+                    raise TnzError(
+                        f"SBA requires 3 bytes, got {order_len}")
+
+                self.__pt_erase = False
+                start = ordidx + 3
+                newaddr = address(b_str[(ordidx+1):start])
+                if debug:
+                    log_debug(" Set Buffer Address %r", newaddr)
+
+                check_address(newaddr)
+                self.bufadd = newaddr
+
+            elif order == 0x1d:  # SF (Start Field)
+                order_len = end - ordidx
+                if order_len < 2:
+                    raise TnzError(
+                        f"SF requires 2 bytes, got {order_len}")
+
+                self.__pt_erase = False
+                fattr = b_str[ordidx+1]
+                bufadd = self.bufadd
+                if debug:
+                    log_debug(" Start Field Value=x%02x @ %r",
+                              fattr, bufadd)
+
+                plane_dc[bufadd] = 0
+                plane_fa[bufadd] = bit6_table[fattr]
+                plane_eh[bufadd] = 0
+                plane_cs[bufadd] = 0
+                plane_fg[bufadd] = 0
+                plane_bg[bufadd] = 0
+                addr1 = bufadd + 1
+                if addr1 == buffer_size:  # if wrap
+                    addr1 = 0
+
+                self.bufadd = addr1
+                if zti:
+                    zti.field(self, bufadd)
+
+                start = ordidx + 2
+
+            elif order == 0x08:  # GE (Graphic Escape)
+                order_len = end - ordidx
+                if order_len < 2:
+                    raise TnzError(
+                        f"GE requires 2 bytes, got {order_len}")
+
+                self.__pt_erase = False
+                ge_byte = b_str[ordidx+1]
+                bufadd = self.bufadd
+                if debug:
+                    log_debug(" Graphic Escape 0x%02x @ %r",
+                              ge_byte, bufadd)
+
+                if zti:
+                    zti.write_data_prep(self, bufadd, 1)
+
+                plane_dc[bufadd] = ge_byte
+                plane_fa[bufadd] = 0
+                plane_eh[bufadd] = self.__proc_eh
+                plane_cs[bufadd] = 0xf1
+                plane_fg[bufadd] = self.__proc_fg
+                plane_bg[bufadd] = self.__proc_bg
+                addr1 = bufadd + 1
+                if addr1 == buffer_size:  # if wrap
+                    addr1 = 0
+
+                self.bufadd = addr1
+                if zti:
+                    # Use force=True to indicate that the data that
+                    # was just updated may have removed a field
+                    # attribute. It also indicates that the update
+                    # did not change the cursor.
+                    zti.write_data(self, bufadd, 1, force=True)
+
+                start = ordidx + 2
+
+            else:
+                start = process_order(b_str, ordidx, end, zti=zti)
 
     def _process_w(self, b_str, start, stop, pid=0, zti=None):
         """Perform host-initiated W (Write)
@@ -3420,14 +3383,15 @@ class Tnz:
                 self._reset_mdt()
 
         else:
-            if wcc & 0x40:  # if bit 1 is 1
-                self._reset_partition()
+            if wcc & 0x4c:  # if bit 1, 4, or 5 is 1 (uncommon)
+                if wcc & 0x40:  # if bit 1 is 1
+                    self._reset_partition()
 
-            if wcc & 0x08:  # if bit 4 is 1
-                self.__log_error(" Start printer not implemented.")
+                if wcc & 0x08:  # if bit 4 is 1
+                    self.__log_error(" Start printer not implemented.")
 
-            if wcc & 0x04:  # if bit 5 is 1
-                self.__log_info("<--- ALARM --->")
+                if wcc & 0x04:  # if bit 5 is 1
+                    self.__log_info("<--- ALARM --->")
 
             if wcc & 0x02:  # if bit 6 is 1
                 self.__log_debug("  WCC keyboard restore bit = 1")
@@ -3596,11 +3560,7 @@ class Tnz:
         """Reset the MDT (modified data tag) for all fields.
         """
         plane_fa = self.plane_fa
-        _bit6 = bit6
-        for faddr, fattr in self.fields():
-            nattr = _bit6(fattr & (255 ^ 1))  # turn off MDT
-            if fattr != nattr:
-                plane_fa[faddr] = nattr
+        plane_fa[:] = plane_fa.translate(_MDT_RESET_TABLE)
 
     def _reset_partition(self):
         """Perform host-initiated Reset Partition.
@@ -3637,19 +3597,17 @@ class Tnz:
         rowcnt = (eaddr - saddr) // maxcol
 
         newstr = self.scrstr(saddr, eaddr)
-        for i in range(0, eaddr-saddr, maxcol):
-            self.readlines.append(newstr[i:i+maxcol].rstrip())
+        lines = [newstr[i:i+maxcol].rstrip()
+                 for i in range(0, eaddr-saddr, maxcol)]
 
         if not keep_all:
-            readlines = self.readlines
-            while rowcnt:
-                line = readlines.pop()
-                if line:
-                    readlines.append(line)
-                    break
-
+            # drop trailing blank lines
+            while rowcnt and not lines[rowcnt-1]:
                 rowcnt -= 1
 
+            del lines[rowcnt:]
+
+        self.readlines.extend(lines)
         row += rowcnt
         self.__readlines_row = row
         if (keep_all or row >= maxrow) and self.readlines_pa2:
@@ -3669,17 +3627,23 @@ class Tnz:
         set 1.
         """
         plane_dc = self.plane_dc
+        plane_cs = self.plane_cs
         rcba = self.rcba
+        append = blst.append
         addr0 = saddr
-        for addr1 in self.__iterbs_addr(self.plane_cs, saddr, eaddr):
-            cii = self.plane_cs[addr0]
+        for addr1 in self.__iterbs_addr(plane_cs, saddr, eaddr):
+            if addr0 < addr1:
+                bytes1 = plane_dc[addr0:addr1]
+            else:  # wraps
+                bytes1 = rcba(plane_dc, addr0, addr1)
+
+            cii = plane_cs[addr0]
             if cii == 0:
-                blst.append(rcba(plane_dc, addr0, addr1))
+                append(bytes1)
 
             elif cii == 0xf1:
-                for addr2 in self.__range_addr(addr0, addr1):
-                    blst.append(b"\x08")  # GE (Graphic Escape)
-                    blst.append(plane_dc[addr2:addr2+1])
+                # GE (Graphic Escape) before each character byte
+                blst.extend(_GE_PAIRS[byte1] for byte1 in bytes1)
             else:
                 raise TnzError(f"cs={cii} not implemented")
 
@@ -3693,10 +3657,7 @@ class Tnz:
         self.__log_debug("__connect(%r, %r, %r, %r)",
                          protocol, host, port, ssl_context)
         loop = asyncio.get_event_loop()
-        if hasattr(asyncio, "current_task"):
-            task = asyncio.current_task()
-        else:
-            task = asyncio.Task.current_task()
+        task = _current_task()
 
         # initialize using running loop implicitly
 
@@ -3764,23 +3725,44 @@ class Tnz:
 
         Assume input range contains no fields.
         """
-        size = eaddr - saddr
-        if size <= 0:
-            size += self.buffer_size
+        planes = (self.plane_dc,
+                  self.plane_eh,
+                  self.plane_cs,
+                  self.plane_fg,
+                  self.plane_bg)
 
-        zeros = b"\x00" * size
-        ucba = self.ucba
-        ucba(self.plane_dc, saddr, zeros)
-        ucba(self.plane_eh, saddr, zeros)
-        ucba(self.plane_cs, saddr, zeros)
-        ucba(self.plane_fg, saddr, zeros)
-        ucba(self.plane_bg, saddr, zeros)
+        zeros = self.__zeros
+        if saddr < eaddr:
+            zeros = zeros[saddr:eaddr]
+            for plane in planes:
+                plane[saddr:eaddr] = zeros
+
+            return
+
+        # vector wraps - erase to end and then from beginning
+        tail = zeros[saddr:]
+        for plane in planes:
+            plane[saddr:] = tail
+
+        if eaddr:
+            zeros = zeros[:eaddr]
+            for plane in planes:
+                plane[:eaddr] = zeros
 
     def __erase_input(self, saddr, eaddr, zti=None):
         self.__log_debug("  ERASE INPUT %d %d", saddr, eaddr)
         field = self.field
         plane_fa = self.plane_fa
         erase = self.__erase
+        if plane_fa.count(0) == self.buffer_size:  # if no fields
+            # whole range is one unprotected field
+            erase(saddr, eaddr)
+            if zti:
+                zti.write(self, -1, saddr, eaddr)
+
+            self.updated = True
+            return
+
         for sa1, ea1 in self.char_addrs(saddr, eaddr):
             if sa1 != saddr:
                 faddr = sa1 - 1
@@ -3817,12 +3799,7 @@ class Tnz:
 
         buffer_size = self.maxrow * self.maxcol
         self.buffer_size = buffer_size
-        self.plane_dc = bytearray(buffer_size)  # data characters
-        self.plane_fa = bytearray(buffer_size)  # field attributes
-        self.plane_eh = bytearray(buffer_size)  # extended hilite
-        self.plane_cs = bytearray(buffer_size)  # character set
-        self.plane_fg = bytearray(buffer_size)  # foreground color
-        self.plane_bg = bytearray(buffer_size)  # background color
+        self.__new_planes()
 
         self.addr16bit = buffer_size >= 16384
         self.curadd = 0
@@ -3830,6 +3807,16 @@ class Tnz:
         if zti:
             zti.erase(self)
 
+    def __fill(self, value, length):
+        """
+        Return a bytes-like object of the input length with every byte
+        set to the input value.
+        """
+        if value:
+            return bytes((value,)) * length
+
+        return self.__zeros[:length]  # shared zero buffer
+
     def __get_event_loop(self):
         loop = self.__loop
         if not loop:
@@ -3854,42 +3841,67 @@ class Tnz:
         if pos >= endpos:
             raise ValueError("pos >= endpos")
 
-        for mat in self.__patbs.finditer(bav, pos, endpos):
-            yield mat.end()
+        # Typically the whole range is one value (e.g. all character
+        # set 0). Let a single C-level count confirm that before
+        # stepping through the range run by run.
+        count = bav.count
+        value1 = bav[pos]
+        count1 = count(value1, pos, endpos)
+        size = endpos - pos
+        if count1 == size:
+            yield endpos
+            return
+
+        # When the range holds only two values (e.g. character sets
+        # 0 and F1), each sequence ends where the other value is
+        # next found.
+        pos = self.__patbs.match(bav, pos, endpos).end()
+        yield pos
+        value2 = bav[pos]
+        if count1 + count(value2, pos, endpos) != size:
+            for mat in self.__patbs.finditer(bav, pos, endpos):
+                yield mat.end()
+
+            return
+
+        find = bav.find
+        while True:
+            value1, value2 = value2, value1
+            pos = find(value2, pos, endpos)
+            if pos < 0:
+                yield endpos
+                return
+
+            yield pos
 
     def __iterbs_addr(self, bav, saddr=0, eaddr=None):
         """
-        Iterate through sequences of same-value bytes in the input
-        bytearray.
+        Return a list of the end addresses of sequences of same-value
+        bytes in the input bytearray.
 
-        Each iteration is represented by a single end address that
-        can be used to describe a vector. For the first iteration,
-        the start address of the vector is the input start address.
-        For subsequent iterations, the start address is the address
-        for the previous iteration.
+        Each end address can be used to describe a vector. For the
+        first vector, the start address is the input start address.
+        For subsequent vectors, the start address is the end address
+        of the previous vector.
         """
         if eaddr is None:
             eaddr = saddr
 
-        if saddr >= eaddr:
-            endpos = len(bav)
-        else:
-            endpos = eaddr
-
-        finditer = self.__patbs.finditer
-        for mat in finditer(bav, saddr, endpos):
-            taddr = mat.end()
-            if saddr >= eaddr and taddr >= endpos:
-                if eaddr != 0 and bav[-1] == bav[0]:
-                    break
+        iterbs = self.__iterbs
+        if saddr < eaddr:
+            return list(iterbs(bav, saddr, eaddr))
 
-                taddr = 0
+        # vector wraps - scan to end and then from beginning
+        addrs = list(iterbs(bav, saddr, len(bav)))
+        if eaddr and bav[-1] == bav[0]:
+            addrs.pop()  # last sequence continues at beginning
+        else:
+            addrs[-1] = 0
 
-            yield taddr
+        if eaddr:
+            addrs.extend(iterbs(bav, 0, eaddr))
 
-        if saddr >= eaddr and eaddr != 0:
-            for mat in finditer(bav, 0, eaddr):
-                yield mat.end()
+        return addrs
 
     def __key_bytes(self, data, codec_index, onerow, zti):
         if self.pwait:
@@ -3899,14 +3911,16 @@ class Tnz:
             raise TnzError("System Lock Input Inhibit")
 
         buffer_size = self.buffer_size
+        curadd = self.curadd
 
         if onerow:
-            cax = self.curadd // self.maxcol  # y
+            maxcol = self.maxcol
+            cax = curadd // maxcol  # y
             cax += 1
-            cax *= self.maxcol
+            cax *= maxcol
             cax %= buffer_size
         else:
-            cax = self.curadd
+            cax = curadd
 
         chars_keyed = 0
         plane_bg = self.plane_bg
@@ -3917,19 +3931,25 @@ class Tnz:
         plane_fg = self.plane_fg
         field = self.field
         next_field = self.next_field
+        zeros = self.__zeros
+        bit6_table = _BIT6_TABLE
+        pos = 0  # index of next byte of data to key
+        fa1 = None  # field of cursor not yet known
         while True:
-            if not data:
+            datalen = len(data) - pos
+            if datalen <= 0:
                 return chars_keyed
 
-            ca1 = self.curadd
+            ca1 = curadd
             if plane_fa[ca1]:
                 self.__log_debug(" data rejected, on field attribute")
                 return chars_keyed  # on field attribute
 
-            datalen = len(data)
             # ca2 = (ca1 + datalen) % buffer_size
 
-            fa1, fattr = field(ca1)
+            if fa1 is None:
+                fa1, fattr = field(ca1)
+
             if fattr & 0x20:  # if protected
                 self.__log_debug("Rejected - Field protected @ %r", fa1)
                 return chars_keyed  # on protected field
@@ -3944,40 +3964,64 @@ class Tnz:
                 fieldlen = buffer_size + fa2 - ca1
 
             usedlen = min(fieldlen, datalen)
-            zeros = b"\x00" * usedlen
-
-            self.ucba(plane_dc, ca1, data[:usedlen])
-            self.ucba(plane_eh, ca1, zeros)
-            self.ucba(plane_cs, ca1, bytes([codec_index]) * usedlen)
-            self.ucba(plane_fg, ca1, zeros)
-            self.ucba(plane_bg, ca1, zeros)
-
-            fattr = bit6(fattr | 1)  # Set MDT (Modified Data Tag)
+            if codec_index:
+                csbytes = bytes([codec_index]) * usedlen
+            else:
+                csbytes = zeros
+
+            # split once for wrap and update all planes together
+            len1 = min(buffer_size - ca1, usedlen)
+            ea1 = ca1 + len1
+            zeros1 = zeros[:len1]
+            plane_dc[ca1:ea1] = data[pos:pos+len1]
+            plane_eh[ca1:ea1] = zeros1
+            plane_cs[ca1:ea1] = csbytes[:len1]
+            plane_fg[ca1:ea1] = zeros1
+            plane_bg[ca1:ea1] = zeros1
+            if len1 < usedlen:  # if wrapped
+                len2 = usedlen - len1
+                zeros2 = zeros[:len2]
+                plane_dc[:len2] = data[pos+len1:pos+usedlen]
+                plane_eh[:len2] = zeros2
+                plane_cs[:len2] = csbytes[len1:usedlen]
+                plane_fg[:len2] = zeros2
+                plane_bg[:len2] = zeros2
+
+            fattr = bit6_table[fattr | 1]  # Set MDT
             plane_fa[fa1] = fattr
 
-            self.curadd = (self.curadd + usedlen) % buffer_size
+            curadd = (curadd + usedlen) % buffer_size
+            self.curadd = curadd
 
             if zti:
-                zti.write(self, fa1, ca1, self.curadd)
+                zti.write(self, fa1, ca1, curadd)
                 zti.rewrite_cursor = True
 
             chars_keyed += usedlen
-            data = data[usedlen:]
-            if self.curadd == cax:
+            pos += usedlen
+            if curadd == cax:
                 return chars_keyed
 
-            fattr = plane_fa[self.curadd]
+            fa1 = None
+            fattr = plane_fa[curadd]
             if fattr:  # if on field attribute
                 if not fattr & 0x10:  # if alphanumeric field
-                    self.curadd += 1
-                    self.curadd %= buffer_size
+                    fa1 = curadd  # field of next cursor address
+                    curadd = (curadd + 1) % buffer_size
+                    self.curadd = curadd
                 else:
                     self.key_tab()
+                    curadd = self.curadd
 
     def __log(self, lvl, *args, **kwargs):
-        self.__log_check()
-        self.__logger.log(lvl, "%s "+args[0],
-                          self.name, *args[1:], **kwargs)
+        logger = self.__logger
+        if not logger:
+            self.__log_check()
+            logger = self.__logger
+
+        if logger.isEnabledFor(lvl):
+            logger.log(lvl, "%s "+args[0],
+                       self.name, *args[1:], **kwargs)
 
     def __log_debug(self, *args, **kwargs):
         return self.__log(logging.DEBUG, *args, **kwargs)
@@ -3988,6 +4032,27 @@ class Tnz:
     def __log_info(self, *args, **kwargs):
         return self.__log(logging.INFO, *args, **kwargs)
 
+    def __new_planes(self):
+        """
+        Allocate empty character buffer planes for the current buffer
+        size.
+
+        All per-address state is kept as one byte per address in
+        parallel planes so that whole ranges can be scanned and
+        updated with bytes-level operations.
+        """
+        buffer_size = self.buffer_size
+        self.plane_dc = bytearray(buffer_size)  # data characters
+        self.plane_fa = bytearray(buffer_size)  # field attributes
+        self.plane_eh = bytearray(buffer_size)  # extended hilite
+        self.plane_cs = bytearray(buffer_size)  # character set
+        self.plane_fg = bytearray(buffer_size)  # foreground color
+        self.plane_bg = bytearray(buffer_size)  # background color
+
+        zeros = self.__zeros
+        if zeros is None or len(zeros) != buffer_size:
+            self.__zeros = memoryview(bytes(buffer_size))  # for erase
+
     def __next_get(self):
         """
         Set up for next get structure field to transfer data to the
@@ -3999,7 +4064,7 @@ class Tnz:
         # ...plus...
         isf = b"\xd0\x46\x05"  # D04605 Data for Get
         isf += b"\x63\x06"  # Record Number Header
-        isf += self.__ddmrecnum.to_bytes(4, byteorder="big")
+        isf += self.__u32.pack(self.__ddmrecnum)
         isf += b"\xc0\x80"  # Data Not Compressed
         isf += b"\x61"  # Begin Data Code
         # ...plus...
@@ -4026,9 +4091,7 @@ class Tnz:
                 # and EBCDIC. And condier that EBCDIC
                 # translation often equates EBCDIC NL with
                 # unicode LF.
-                data = data.replace("\n", "\r")
-                data = data.encode(self.__indsenc)
-                data = data.replace(b"\r", b"\r\n")
+                data = self.__encode_crlf(data, self.__indsenc)
 
                 self.__indspend += data
                 if len(self.__indspend) >= maxlen:
@@ -4049,17 +4112,40 @@ class Tnz:
         self.__log_debug("DDM NEXT record (%d) is %d byte(s)",
                          self.__ddmrecnum, len(data))
 
-        isf += (len(data)+5).to_bytes(2, byteorder="big")
-        isf += data
-        isf = (len(isf)+2).to_bytes(2, byteorder="big")+isf
-
-        self.__indsisf = isf
+        u16 = self.__u16.pack
+        datalen = len(data)
+        self.__indsisf = b"".join((u16(len(isf)+datalen+4),
+                                   isf,
+                                   u16(datalen+5),
+                                   data))
 
     def __query_reply(self, reqtype=None, qcode=None):
         """Perform query reply.
         """
         self.__log_debug("query reply %r %r", reqtype, qcode)
-        rec = b"\x88"  # SF (Structured Field AID)
+
+        # The reply only depends on these settings and they rarely
+        # change during a session. Reuse the last reply built.
+        key = (self.capable_color,
+               self.amaxrow, self.amaxcol,
+               self.dmaxrow, self.dmaxcol,
+               self.alt, self.cs_00, self.cp_00,
+               self.cs_F1, self.cp_F1,
+               self._limin, self._limout)
+        cache = self.__query_reply_cache
+        if cache and cache[0] == key:
+            rec = cache[1]
+        else:
+            rec = self.__query_reply_rec()
+            self.__query_reply_cache = (key, rec)
+
+        self.send_3270_data(rec)
+
+    def __query_reply_rec(self):
+        """Build query reply record.
+        """
+        u16 = self.__u16.pack
+        rec = bytearray(b"\x88")  # SF (Structured Field AID)
 
         # 80 Query Reply (Summary)
         sfb = b"\x80"  # Summary Query Reply
@@ -4075,8 +4161,8 @@ class Tnz:
         sfb += b"\xa6"  # Implicit Partitions
 
         # End of Summary
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # 81 Query Reply (Usable Area)
@@ -4097,22 +4183,22 @@ class Tnz:
         #       bit 2   - CELLUNITS Value in bytes 6 & 7, 8 and 9; pels
         #       bit 3-7 - Reserved
         sfb += b"\x00"  # Flags (5)
-        sfb += self.amaxcol.to_bytes(2, byteorder="big")  # W
-        sfb += self.amaxrow.to_bytes(2, byteorder="big")  # H
+        sfb += u16(self.amaxcol)  # W
+        sfb += u16(self.amaxrow)  # H
         sfb += b"\x00"  # UNITS Pel measurement - inches
         # Horizontal distance between points as fraction ?
-        sfb += (1).to_bytes(2, byteorder="big")  # Xr numerator
-        sfb += (96).to_bytes(2, byteorder="big")  # Xr denominator
+        sfb += u16(1)  # Xr numerator
+        sfb += u16(96)  # Xr denominator
         # Vertical distance between points as fraction ?
-        sfb += (1).to_bytes(2, byteorder="big")  # Yr numerator
-        sfb += (96).to_bytes(2, byteorder="big")  # Yr denominator
+        sfb += u16(1)  # Yr numerator
+        sfb += u16(96)  # Yr denominator
         sfb += b"\x06"  # AW Number of X units in default cell?
         sfb += b"\x0c"  # AH Number of Y units in default cell?
         # BUFSZ onward may not be needed
         # Only set BUFSZ non-zero if paritions NOT supported
         # End of Usable Area
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # A6 Query Reply (Implicit Partitions)
@@ -4123,13 +4209,13 @@ class Tnz:
         sfb += b"\x0b"  # Length of this self-defining parameter
         sfb += b"\x01"  # Implicit Partition Sizes
         sfb += b"\x00"  # Flags (Reserved)
-        sfb += self.dmaxcol.to_bytes(2, byteorder="big")  # WD
-        sfb += self.dmaxrow.to_bytes(2, byteorder="big")  # HD
-        sfb += self.amaxcol.to_bytes(2, byteorder="big")  # WA
-        sfb += self.amaxrow.to_bytes(2, byteorder="big")  # HA
+        sfb += u16(self.dmaxcol)  # WD
+        sfb += u16(self.dmaxrow)  # HD
+        sfb += u16(self.amaxcol)  # WA
+        sfb += u16(self.amaxrow)  # HA
         # End of Implicit Partitions
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # 85 Query Reply (Character Sets)
@@ -4178,8 +4264,8 @@ class Tnz:
 
         # CGCSGID made up of 2-byte chararacter set number followed
         # by 2-byte code page number.
-        sfb += (self.cs_00).to_bytes(2, byteorder="big")
-        sfb += (self.cp_00).to_bytes(2, byteorder="big")
+        sfb += u16(self.cs_00)
+        sfb += u16(self.cp_00)
 
         if self.alt:
             # Character Set Descriptor 2
@@ -4201,12 +4287,12 @@ class Tnz:
 
             # CGCSGID made up of 2-byte chararacter set number followed
             # by 2-byte code page number.
-            sfb += (self.cs_F1).to_bytes(2, byteorder="big")
-            sfb += (self.cp_F1).to_bytes(2, byteorder="big")
+            sfb += u16(self.cs_F1)
+            sfb += u16(self.cp_F1)
 
         # End of Character Sets)
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # 87 Query Reply (Highlight)
@@ -4226,8 +4312,8 @@ class Tnz:
         sfb += b"\xf4\xf4"  # value f4 -> action f4 = underscore
         sfb += b"\xf8\xf8"  # value f8 -> action f8 = intensify
         # End of Highlight
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # 88 Query Reply (Reply Modes)
@@ -4236,21 +4322,21 @@ class Tnz:
         sfb += b"\x01"  # Extended Field Mode
         sfb += b"\x02"  # Character mode
         # End of Reply Modes
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # 95 Query Reply (DDM)
         # (for file transfer)
         sfb = b"\x95"  # QCODE for the DDM Query Reply
         sfb += b"\x00\x00"  # Flags reserved
-        sfb += self._limin.to_bytes(2, byteorder="big")  # LIMIN
-        sfb += self._limout.to_bytes(2, byteorder="big")  # LIMOUT
+        sfb += u16(self._limin)  # LIMIN
+        sfb += u16(self._limout)  # LIMOUT
         sfb += b"\x01"  # NSS Number of subsets supported
         sfb += b"\x01"  # DDMSS DDM subset identifier
         # End of DDM
-        sfb = b"\x81"+sfb  # Query Reply
-        sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+        rec += u16(len(sfb)+3)
+        rec += b"\x81"  # Query Reply
         rec += sfb
 
         # 86 Query Reply (Color)
@@ -4275,24 +4361,11 @@ class Tnz:
             sfb += b"\xf6\xf6"  # F6 -> Yellow
             sfb += b"\xf7\xf7"  # F7 -> White?
             # End of Highlight
-            sfb = b"\x81"+sfb  # Query Reply
-            sfb = (len(sfb)+2).to_bytes(2, byteorder="big")+sfb
+            rec += u16(len(sfb)+3)
+            rec += b"\x81"  # Query Reply
             rec += sfb
 
-        self.send_3270_data(rec)
-
-    def __range_addr(self, saddr, eaddr):
-        if saddr >= eaddr:
-            endpos = self.buffer_size
-        else:
-            endpos = eaddr
-
-        for addr in range(saddr, endpos):
-            yield addr
-
-        if 0 < eaddr <= saddr:
-            for addr in range(0, eaddr):
-                yield addr
+        return bytes(rec)
 
     def __read_buffer(self):
         """Process RB (Read Buffer) 3270 Data Stream Command.
@@ -4307,11 +4380,15 @@ class Tnz:
         self.__log_debug(" aid: 0x%02x", self.aid)
         baddr = self.address_bytes(self.curadd)
         self.__log_debug(" cursor %r", baddr)
-        rec = bytes([self.aid]) + baddr
+        rec = bytearray()
+        rec.append(self.aid)
+        rec += baddr
 
         reply_mode = self.__reply_mode
         reply_cattrs = self.__reply_cattrs
         buffer_size = self.buffer_size
+        blst = []
+        append = blst.append
         addr = 0
         while addr < buffer_size:
             while addr < buffer_size:
@@ -4320,43 +4397,36 @@ class Tnz:
                     break
 
                 self.__log_debug(" SF %s", hex(fattr))
-                sfb = [0x1d, fattr]  # SF (Start Field) fattr
+                sfb = bytes((0x1d, fattr))  # SF (Start Field) fattr
                 if reply_mode:  # Extended Field or Character
-                    sfe = [0x29, 0]  # SFE (Start Field Extended) 0
+                    # SFE (Start Field Extended) 0
+                    sfe = bytearray(b"\x29\x00")
 
                     attr = self.plane_eh[addr]
                     if attr:  # if not default
-                        sfe[1] += 1
-                        sfe.append(0x41)
-                        sfe.append(attr)
+                        sfe += bytes((0x41, attr))
 
                     attr = self.plane_fg[addr]
                     if attr:  # if not default
-                        sfe[1] += 1
-                        sfe.append(0x42)
-                        sfe.append(attr)
+                        sfe += bytes((0x42, attr))
 
                     attr = self.plane_cs[addr]
                     if attr:  # if not default
-                        sfe[1] += 1
-                        sfe.append(0x43)
-                        sfe.append(attr)
+                        sfe += bytes((0x43, attr))
 
                     attr = self.plane_bg[addr]
                     if attr:  # if not default
-                        sfe[1] += 1
-                        sfe.append(0x45)
-                        sfe.append(attr)
+                        sfe += bytes((0x45, attr))
 
+                    sfe[1] = len(sfe) // 2 - 1  # number of pairs
                     if sfe[1] != 0x40:  # if not default`
                         if fattr:
                             sfe[1] += 1
-                            sfe.append(0xc0)
-                            sfe.append(fattr)
+                            sfe += bytes((0xc0, fattr))
 
                         sfb = sfe
 
-                rec += bytes(sfb)
+                rec += sfb
                 addr += 1
             else:
                 break
@@ -4364,8 +4434,7 @@ class Tnz:
             eindex = self.__pat0s.search(self.plane_fa, addr).end()
             eaddr = eindex % buffer_size
 
-            blst = []
-            append = blst.append
+            blst.clear()
             if reply_mode in (0x00, 0x01):  # [Extended] Field mode
                 # TODO following needs to NOT append null characters
                 self.__append_char_bytes(blst, addr, eaddr)
@@ -4437,69 +4506,89 @@ class Tnz:
                 if line not in ("***", " ***"):
                     self.readlines.append(line)
 
+    def __set_attr_bg(self, addr, fav):
+        """Set background color attribute.
+        """
+        self.plane_bg[addr] = fav
+
+    def __set_attr_cs(self, addr, fav):
+        """Set character set attribute.
+        """
+        self.plane_cs[addr] = fav
+
+    def __set_attr_eh(self, addr, fav):
+        """Set extended highlighting attribute.
+        """
+        self.plane_eh[addr] = fav
+
+    def __set_attr_fa(self, addr, fav):
+        """Set 3270 field attribute.
+        """
+        self.plane_fa[addr] = _BIT6_TABLE[fav]
+
+    def __set_attr_fg(self, addr, fav):
+        """Set foreground color attribute.
+        """
+        self.plane_fg[addr] = fav
+
     def __set_attributes(self, addr, b_str, b_idx, zti=None):
         """
         Set field attributes according to input attributes in the
         format used by MF and SFE.
         """
-        pairs = []
+        attr_setters = self.__attr_setters
         start = b_idx + 1
         stop = start + b_str[b_idx] * 2
-        for pair_index in range(start, stop, 2):
-            fat = b_str[pair_index]
-            fav = b_str[pair_index + 1]
-            pairs.append((bytes([fat]), bytes([fav])))
-
-            if fat == 0xc0:  # 3270 field attribute
-                self.plane_fa[addr] = bit6(fav)
-
-            elif fat == 0x41:  # extended highlighting
-                self.plane_eh[addr] = fav
-
-            elif fat == 0x42:  # foreground color
-                if not self.__extended_color_mode:
-                    if zti:
-                        zti.extended_color(self)
-
-                    self.__extended_color_mode = True
-
-                self.plane_fg[addr] = fav
-
-            elif fat == 0x43:  # character set
-                self.plane_cs[addr] = fav
+        if stop > len(b_str):
+            raise TnzError(f"{b_str[b_idx]} attribute pairs require "
+                           f"{stop - start} bytes, "
+                           f"got {len(b_str) - start}")
+
+        fats = b_str[start:stop:2]
+        favs = b_str[start+1:stop:2]
+        for fat, fav in zip(fats, favs):
+            setter = attr_setters[fat]
+            if not setter:
+                raise TnzError(f"Bad field attribute type: {fat}")
 
-            elif fat == 0x45:  # background color
-                if not self.__extended_color_mode:
-                    if zti:
-                        zti.extended_color(self)
-                    self.__extended_color_mode = True
+            setter(self, addr, fav)
 
-                self.plane_bg[addr] = fav
+        # foreground (x42) or background (x45) color
+        if not self.__extended_color_mode:
+            if 0x42 in fats or 0x45 in fats:
+                if zti:
+                    zti.extended_color(self)
 
-            else:
-                raise TnzError(f"Bad field attribute type: {fat}")
+                self.__extended_color_mode = True
 
+        bytes1 = _BYTES1.__getitem__
+        pairs = list(zip(map(bytes1, fats), map(bytes1, favs)))
         return stop, pairs
 
     async def __start_tls(self, context):
         self.__log_debug("__start_tls(%r)", context)
 
         loop = asyncio.get_event_loop()
-        if hasattr(asyncio, "current_task"):
-            task = asyncio.current_task()
-        else:
-            task = asyncio.Task.current_task()
+        task = _current_task()
 
         transport = self._transport
         protocol = transport.get_protocol()
         self._transport = None
         server_hostname = None
-        if context.check_hostname:
-            server_hostname = self.__start_tls_hostname
-            if server_hostname is None:
-                raise TnzError("no hostname for check_hostname")
-
         try:
+            if context.check_hostname:
+                # resolve only now that it is needed, off the event loop
+                host = self.__start_tls_host
+                if host is not None:
+                    try:
+                        server_hostname = await loop.run_in_executor(
+                            None, socket.getfqdn, host)
+                    except socket.gaierror:
+                        pass
+
+                if server_hostname is None:
+                    raise TnzError("no hostname for check_hostname")
+
             transport = await loop.start_tls(
                 transport,
                 protocol,
@@ -4541,14 +4630,30 @@ class Tnz:
             if saddr < 0 or saddr == eaddr:
                 return 0
 
-        is_protected_attr = self.is_protected_attr
-        saddr = (saddr+1) % self.buffer_size
-        for sa1, _ in self.char_addrs(saddr, eaddr):
-            fattr = plane_fa[sa1-1]
-            if not is_protected_attr(fattr):
-                return sa1
+        buffer_size = self.buffer_size
+        saddr = (saddr+1) % buffer_size
+        if eaddr is None:
+            eaddr = saddr
+
+        # Result is the first address in range that has a character
+        # with an unprotected field attribute in the previous address.
+        # Mark field attributes and prepend the mark of the last
+        # address so that index i holds the mark of address i-1. Then
+        # search for an unprotected mark followed by no mark.
+        marks = plane_fa.translate(_TAB_MARKS)
+        marks = marks[-1:] + marks
+        find = marks.find
+        if saddr < eaddr:
+            addr = find(b"\x01\x00", saddr, eaddr + 1)
+        else:
+            addr = find(b"\x01\x00", saddr)
+            if addr < 0:
+                addr = find(b"\x01\x00", 0, eaddr + 1)
 
-        return 0
+        if addr < 0:
+            return 0
+
+        return addr
 
     # Class methods
 
@@ -4586,16 +4691,108 @@ class Tnz:
         logd["disable_existing_loggers"] = False
         dictConfig(logd)
 
+    @classmethod
+    def __decode_crlf(cls, data, encoding):
+        """Decode IND$FILE data converting CRLF to LF.
+
+        When the encoding has single byte encodings for CR and LF,
+        the LF removal and CR conversion are done by a single
+        bytes.translate before decoding.
+        """
+        trans = cls.__crlf_trans.get(encoding)
+        if trans is None:
+            trans = False
+            try:
+                lf_byte = "\n".encode(encoding)
+                if (len(lf_byte) == 1 and
+                        "\r".encode(encoding) == b"\r" and
+                        lf_byte.decode(encoding) == "\n"):
+                    trans = bytes.maketrans(b"\r", lf_byte)
+
+            except UnicodeError:
+                pass
+
+            cls.__crlf_trans[encoding] = trans
+
+        if trans:
+            return data.translate(trans, b"\n").decode(encoding)
+
+        data = data.replace(b"\n", b"")
+        data = data.decode(encoding)
+        return data.replace("\r", "\n")
+
+    @classmethod
+    def __decode_dc(cls, data, codec_info):
+        """Decode character buffer data for display.
+
+        Control characters are translated to spaces, the data is
+        decoded using the input codec, and characters that are not
+        in the code page are translated by unicode ordinal. For a
+        single byte codec, this is done by a single charmap decode.
+        """
+        name = codec_info.name
+        table = cls.__dc_decode_tables.get(name)
+        if table is None:
+            table = False
+            try:
+                data1 = bytes(range(256)).translate(cls.__trans_dc_to_c)
+                chars = codec_info.decode(data1)[0]
+                if len(chars) == 256 and "\ufffe" not in chars:
+                    table = chars.translate(cls.__trans_ords)
+
+            except UnicodeError:
+                pass
+
+            cls.__dc_decode_tables[name] = table
+
+        if table:
+            return codecs.charmap_decode(data, "strict", table)[0]
+
+        data = data.translate(cls.__trans_dc_to_c)
+        return codec_info.decode(data)[0].translate(cls.__trans_ords)
+
+    @classmethod
+    def __encode_crlf(cls, data, encoding):
+        """Encode IND$FILE data converting CR and LF to CRLF.
+
+        The LF in the CRLF is always the ascii LF byte value. When
+        that byte decodes to a single character and CR encodes to
+        CR, the conversion is done by a single str.translate before
+        encoding.
+        """
+        trans = cls.__crlf_encode_trans.get(encoding)
+        if trans is None:
+            trans = False
+            try:
+                lf_char = b"\n".decode(encoding)
+                if (len(lf_char) == 1 and
+                        "\r".encode(encoding) == b"\r" and
+                        lf_char.encode(encoding) == b"\n"):
+                    trans = {0x0a: "\r"+lf_char, 0x0d: "\r"+lf_char}
+
+            except UnicodeError:
+                pass
+
+            cls.__crlf_encode_trans[encoding] = trans
+
+        if trans:
+            return data.translate(trans).encode(encoding)
+
+        data = data.replace("\n", "\r")
+        data = data.encode(encoding)
+        return data.replace(b"\r", b"\r\n")
+
     @classmethod
     def __tnon(cls, value):
         """Translate input byte to a telnet option name.
         """
         if isinstance(value, int):
-            value = bytes([value])
+            value = _BYTES1[value]
 
-        name = cls.__tn_options.get(value)
-        if name:
-            return name
+        if len(value) == 1:
+            name = cls.__tn_options[value[0]]
+            if name:
+                return name
 
         return "0x"+value.hex()
 
@@ -4605,32 +4802,7 @@ class Tnz:
     def fav_repr(fav):
         """Return string representation of field attribute value.
         """
-        fa_str = ""
-        if fav & 0x20:  # if protected field
-            fa_str += "P"  # protected
-        else:
-            fa_str += "u"  # unprotected
-
-        if fav & 0x10:  # if numeric-only field
-            fa_str += "N"  # numeric
-        else:
-            fa_str += "a"  # alphanumeric
-
-        if not fav & 12:  # if b00..
-            fa_str += "00"  # Display/not selector-pen-detectable
-        elif fav & 12 == 4:  # if b01..
-            fa_str += "01"  # Display/selector-pen-detectable
-        elif fav & 12 == 8:  # if b10..
-            fa_str += "10"  # Intensified display/pen-detect
-        else:  # b11..
-            fa_str += "11"  # Nondisplay, nondetectable (nonprint)
-
-        if fav & 1 != 0:
-            fa_str += "M"  # Modified
-        else:
-            fa_str += "m"  # Not modified
-
-        return fa_str
+        return _FAV_REPRS[fav & 255]
 
     @staticmethod
     def is_detectable_attr(attr):
@@ -4710,7 +4882,14 @@ class Tnz:
         if start < stop:
             return value[start:stop]
 
-        return value[start:]+value[:stop]
+        # join the two memoryview parts into a single new object
+        try:
+            view = memoryview(value)
+            join = value[:0].join
+        except (TypeError, AttributeError):  # e.g. str or list
+            return value[start:] + value[:stop]
+
+        return join((view[start:], view[:stop]))
 
     @staticmethod
     def ucba(dst, start, src, begidx=0, endidx=None):
@@ -4745,9 +4924,14 @@ class Tnz:
 
         enda = start + len1
         endd = begidx + len1
-        dst[start:enda] = src[begidx:endd]
+        try:
+            view = memoryview(src)  # copy without intermediate slices
+        except TypeError:  # e.g. a list of ints
+            view = src
+
+        dst[start:enda] = view[begidx:endd]
         if len2:
-            dst[:len2] = src[endd:endidx]
+            dst[:len2] = view[endd:endidx]
 
     # Private static methods
 
@@ -4813,13 +4997,15 @@ class Tnz:
         else:
             encoding, idx = value, 0
 
-        code_page = re.findall("\\d+$", encoding)
-        if len(code_page) != 1:
+        i = len(encoding)
+        while i and encoding[i-1].isdecimal():
+            i -= 1
+
+        if i == len(encoding):
             raise ValueError("Does not end in code page number")
 
-        code_page = int(code_page[0])
+        code_page = int(encoding[i:])
 
-        import codecs
         self.codec_info[idx] = codecs.lookup(encoding)
 
         if idx == 0:
@@ -4862,13 +5048,73 @@ class Tnz:
                     0x1c: 0x2611,  # DUP -> check-mark???
                     0x1e: 0x2612}  # FM -> x-mark???
 
+    # DDM inbound records: SF (Structured Field AID), structured
+    # field length, and structured field
+    __ddm_open_ack = (b"\x88\x00\x05"
+                      b"\xd0\x00\x09")  # D00009 Open Acknowledgement
+    __ddm_open_error = (b"\x88\x00\x09"
+                        b"\xd0\x00\x08"  # D00008 Open Error
+                        b"\x69\x04"  # Error Code Header
+                        b"\x01\x00")  # Open Failed Exception
+    __ddm_close_ack = (b"\x88\x00\x05"
+                       b"\xd0\x41\x09")  # D04109 Close Acknowledgement
+    __ddm_set_cursor_error = (b"\x88\x00\x09"
+                              b"\xd0\x45\x08"  # D04508 Set Cursor Error
+                              b"\x69\x04"  # Error Code Header
+                              b"\x60\x00")  # Command Syntax Error
+    __ddm_get_error = (b"\x88\x00\x09"
+                       b"\xd0\x46\x08"  # D04608 Get Error
+                       b"\x69\x04"  # Error Code Header
+                       b"\x60\x00")  # Command Syntax Error
+    __ddm_get_eof = (b"\x88\x00\x09"
+                     b"\xd0\x46\x08"  # D04608 Get Error
+                     b"\x69\x04"  # Error Code Header
+                     b"\x22\x00")  # Get Past End of File
+    __ddm_insert_error = (b"\x88\x00\x09"
+                          b"\xd0\x47\x08"  # D04708 Insert Error
+                          b"\x69\x04"  # Error Code Header
+                          b"\x60\x00")  # Command Syntax Error
+    # followed by 4-byte record number
+    __ddm_data_ack = (b"\x88\x00\x0b"
+                      b"\xd0\x47\x05"  # D04705 Data Acknowledgement
+                      b"\x63\x06")  # Record Number Header
+
+    # method names by byte value for dispatch (e.g. _process_order_0x5)
+    __command_names = tuple(f"_process_command_{i:#x}"
+                            for i in range(256))
+    __order_names = tuple(f"_process_order_{i:#x}" for i in range(256))
+    __wsf_names = tuple(f"_process_wsf_{i:#x}" for i in range(256))
+
+    # __set_attributes functions by attribute type
+    __attr_setters = tuple(map({
+        0x41: __set_attr_eh,  # extended highlighting
+        0x42: __set_attr_fg,  # foreground color
+        0x43: __set_attr_cs,  # character set
+        0x45: __set_attr_bg,  # background color
+        0xc0: __set_attr_fa,  # 3270 field attribute
+        }.get, range(256)))
+
+    # 2-byte big-endian unsigned integer (e.g. lengths)
+    __u16 = struct.Struct(">H")
+
+    # 4-byte big-endian unsigned integer (e.g. record numbers)
+    __u32 = struct.Struct(">I")
+
+    # translate tables for __decode_crlf by encoding
+    __crlf_trans = {}
+
+    # translate tables for __encode_crlf by encoding
+    __crlf_encode_trans = {}
+
+    # charmap decoding tables for __decode_dc by codec name
+    __dc_decode_tables = {}
+
     # compiled regular expression patterns
     __pat0s = re.compile(b"\x00+")
     __patn0 = re.compile(b"[^\x00]")
     __patn0l = re.compile(b"[^\x00][\x00]*\\Z")
-    __patbs = re.compile(b"(.)\\1*")
+    __patbs = re.compile(b"(.)\\1*", flags=re.DOTALL)
     __patord = re.compile(b"[\x05\x08\x11\x12\x13\x1d\x28\x29\x2c\x3c]")
-    __pat0n0s = re.compile(b"[^\x00]\x00+")
     __pat_cmd = re.compile(b"\xff(?:[\x00-\xfa\xff]|..)",
                            flags=re.DOTALL)
     __pat_data = re.compile(b"(?:[\x00-\xfe]|\xff\xff)+")
@@ -4880,16 +5126,17 @@ class Tnz:
         RENTER = enum.auto()
         RREAD = enum.auto()
 
-    __tn_options = {b"\x00": "TRANSMIT-BINARY",
-                    b"\x01": "ECHO",
-                    b"\x03": "SUPPRESS-GO-AHEAD",
-                    b"\x06": "TIMING-MARK",
-                    b"\x18": "TERMINAL-TYPE",
-                    b"\x19": "END-OF-RECORD",
-                    b"\x1d": "3270-REGIME",
-                    b"\x28": "TN3270E",
-                    b"\x2e": "START_TLS",
-                    }
+    # telnet option names indexed by option byte
+    __tn_options = tuple(map({0x00: "TRANSMIT-BINARY",
+                              0x01: "ECHO",
+                              0x03: "SUPPRESS-GO-AHEAD",
+                              0x06: "TIMING-MARK",
+                              0x18: "TERMINAL-TYPE",
+                              0x19: "END-OF-RECORD",
+                              0x1d: "3270-REGIME",
+                              0x28: "TN3270E",
+                              0x2e: "START_TLS",
+                              }.get, range(256)))
 
 
 class TnzError(Exception):
@@ -4916,6 +5163,12 @@ def bit6(control_int):
     make the byte a printable character. See figure D-1 in Data
     Stream Programmers Reference.
     """
+    return _BIT6_TABLE[control_int & 63]  # x3f - zero bits 0,1
+
+
+def _bit6(control_int):
+    """Compute bit6 result (used to build _BIT6_TABLE).
+    """
     control_int &= 63  # x3f - zero bits 0,1
     cc11 = control_int | 192  # input with bits 0,1 = 11
 
@@ -4933,6 +5186,63 @@ def bit6(control_int):
     return cc01  # aa aaaa -> 01aa aaaa
 
 
+def _fav_repr(fav):
+    """Compute fav_repr result (used to build _FAV_REPRS).
+    """
+    fa_str = ""
+    if fav & 0x20:  # if protected field
+        fa_str += "P"  # protected
+    else:
+        fa_str += "u"  # unprotected
+
+    if fav & 0x10:  # if numeric-only field
+        fa_str += "N"  # numeric
+    else:
+        fa_str += "a"  # alphanumeric
+
+    if not fav & 12:  # if b00..
+        fa_str += "00"  # Display/not selector-pen-detectable
+    elif fav & 12 == 4:  # if b01..
+        fa_str += "01"  # Display/selector-pen-detectable
+    elif fav & 12 == 8:  # if b10..
+        fa_str += "10"  # Intensified display/pen-detect
+    else:  # b11..
+        fa_str += "11"  # Nondisplay, nondetectable (nonprint)
+
+    if fav & 1 != 0:
+        fa_str += "M"  # Modified
+    else:
+        fa_str += "m"  # Not modified
+
+    return fa_str
+
+
+# bit6 results for all byte values (e.g. _BIT6_TABLE[fattr])
+_BIT6_TABLE = bytes(_bit6(i) for i in range(256))
+
+# field attributes with MDT turned off (e.g. for _reset_mdt)
+_MDT_RESET_TABLE = bytes(bit6(i & (255 ^ 1)) if i else 0
+                         for i in range(256))
+
+# fav_repr results for all byte values
+_FAV_REPRS = tuple(_fav_repr(i) for i in range(256))
+
+# field attributes marked for tab: 1 if unprotected, 2 if protected
+_TAB_MARKS = bytes(2 if i & 0x20 else 1 if i else 0 for i in range(256))
+
+# GE (Graphic Escape) followed by each byte value (e.g. _GE_PAIRS[b])
+_GE_PAIRS = tuple(bytes((0x08, i)) for i in range(256))
+
+# single-byte bytes objects for all byte values (e.g. _BYTES1[b])
+_BYTES1 = tuple(bytes((i,)) for i in range(256))
+
+# asyncio.current_task was added in Python 3.7
+if hasattr(asyncio, "current_task"):
+    _current_task = asyncio.current_task
+else:
+    _current_task = asyncio.Task.current_task
+
+
 def connect(host=None, port=None,
             secure=None, verifycert=None,
             name=None, *,
@@ -50,6 +50,7 @@ if __name__ == "__main__":
     raise SystemExit(zti.main())
 
 import atexit
+import bisect
 import cmd
 import logging
 import os
@@ -117,6 +118,9 @@ class Zti(cmd.Cmd):
 
         self.pend_intro = None
         self.__dirty_ranges = []
+        self.__header_cursor = None  # (row, col) shown in header
+        self.__header_keylock = None  # KEYLOCK shown in header
+        self.__header_cursor_at = None  # (tns, y, x, rlen, clen)
         self.single_session = False
         self.colors = 768
         self.cv2attr = {}
@@ -206,44 +210,10 @@ class Zti(cmd.Cmd):
                 raise
 
     def complete_goto(self, text, line, begidx, endidx):
-        textu = text.upper()
-        textl = len(text)
-        line_lower = line.islower()
-        line_upper = line.isupper()
-        slist = ati.ati.sessions.split()
-        completions = []
-        for session in slist:
-            if session.startswith(textu):
-                if line_lower:
-                    completion = text + session[textl:].lower()
-                elif line_upper:
-                    completion = text + session[textl:].upper()
-                else:
-                    completion = text + session[textl:]
-
-                completions.append(completion)
-
-        return completions
+        return self.__complete(text, line, ati.ati.sessions.split())
 
     def complete_say(self, text, line, begidx, endidx):
-        textu = text.upper()
-        textl = len(text)
-        line_lower = line.islower()
-        line_upper = line.isupper()
-        klist = ati.ati.keys()
-        completions = []
-        for akey in klist:
-            if akey.startswith(textu):
-                if line_lower:
-                    completion = text + akey[textl:].lower()
-                elif line_upper:
-                    completion = text + akey[textl:].upper()
-                else:
-                    completion = text + akey[textl:]
-
-                completions.append(completion)
-
-        return completions
+        return self.__complete(text, line, ati.ati.keys())
 
     def default(self, line):
         """Override cmd.Cmd.default
@@ -349,11 +319,15 @@ class Zti(cmd.Cmd):
         """
         self.__bg_wait_end()
         self.__downcnt = len(self.downloads)
+        lines = []
         for i in range(0, self.__downcnt):
             download = self.downloads[i]
-            print(str(i)+" "+repr(download))
+            lines.append(str(i)+" "+repr(download))
             os.environ["d"+str(i)] = download.file.name
 
+        if lines:
+            print("\n".join(lines))
+
     def do_drop(self, arg):
         """Drop and ATI-like variable.
 
@@ -406,18 +380,20 @@ class Zti(cmd.Cmd):
         saddr = 0
         eaddr = 0
         first = True
+        lines = []
         for faddr, _ in tns.fields():
             if first:
                 first = False
                 eaddr = faddr
             else:
                 text = tns.scrstr(saddr, faddr)
-                print(repr((saddr, faddr)), repr(text))
+                lines.append(f"{(saddr, faddr)!r} {text!r}")
 
             saddr = faddr
 
         text = tns.scrstr(saddr, eaddr)
-        print(repr((saddr, eaddr)), repr(text))
+        lines.append(f"{(saddr, eaddr)!r} {text!r}")
+        print("\n".join(lines))
 
     def do_goto(self, arg):
         """Command to go to a session in full-screen.
@@ -465,28 +441,29 @@ class Zti(cmd.Cmd):
 
         if not arg and not sessions:
             new_session = "A"
-            hostname = os.getenv("SESSION_HOST", None)
-            hostname = ati.ati["SESSION_HOST"] or hostname
+            hostname = (ati.ati["SESSION_HOST"] or
+                        os.getenv("SESSION_HOST", None))
 
         elif not arg:
             ati.ati.session = ati.ati.session
 
         else:
+            session_names = set(sessions.split())
             args = arg.split(maxsplit=1)
             sesname = args[0]
-            if sesname.upper() in sessions.split():
+            if sesname.upper() in session_names:
                 ati.ati.session = sesname
 
             else:
                 new_session = sesname
                 hostname = args[-1]
                 if len(args) == 1:
-                    hostname = os.getenv("SESSION_HOST", None)
-                    hostname = ati.ati["SESSION_HOST"] or hostname
+                    hostname = (ati.ati["SESSION_HOST"] or
+                                os.getenv("SESSION_HOST", None))
                     if not hostname:
                         hostname = sesname
                         new_session = sesname.split(".", maxsplit=1)[0]
-                        if new_session.upper() in sessions.split():
+                        if new_session.upper() in session_names:
                             new_session = None
                             ati.ati.session = sesname
 
@@ -630,7 +607,7 @@ class Zti(cmd.Cmd):
 
         tns.readlines = []
         if lines:
-            print(*lines, sep="\n")
+            print("\n".join(lines))
 
     def do_receive(self, arg):
         """Received a downloaded file.
@@ -648,18 +625,13 @@ class Zti(cmd.Cmd):
         name = download.file.name
         dest = arg
 
-        if rexx.words(arg) > 1:
-            if rexx.word(arg, 1).lower() == "ascii":
-                dest = rexx.subword(arg, 2)
-                with open(name, "r+b") as file:
-                    bstr = file.read()
-                    if bstr.endswith(b'\x1a'):
-                        bstr = bstr[:-1]
-
-                    bstr = bstr.replace(b'\r\n', b'\n')
-                    cstr = bstr.decode('iso8859-1')  # ?
+        args = arg.split(maxsplit=1)
+        if len(args) > 1:
+            if args[0].lower() == "ascii":
+                dest = args[1].rstrip()
+                with open(name, "rb") as file:
                     with open(dest, "w", encoding="utf-8") as file2:
-                        file2.write(cstr)
+                        self._receive_ascii(file, file2)
                         dest = None
 
         if dest:
@@ -725,7 +697,8 @@ class Zti(cmd.Cmd):
             print("variable name required")
             return
 
-        name = rexx.word(arg, 1).upper()
+        args = arg.split(maxsplit=1)
+        name = args[0].upper() if args else ""
         if name in ("MAXWAIT", "SHOWLINE"):
             print(f"{name} IS WRITE-ONLY")
             return
@@ -763,16 +736,17 @@ class Zti(cmd.Cmd):
             print("NONE")
             return
 
+        lines = []
         pnaddr, pnport = tns.getpeername()
-        print(f" SESSION_HOST={pnaddr}")
-        print(f" SESSION_PORT={pnport}")
+        lines.append(f" SESSION_HOST={pnaddr}")
+        lines.append(f" SESSION_PORT={pnport}")
 
         lu_name = tns.lu_name
         if lu_name:
-            print(f" SESSION_LU_NAME={lu_name}")
+            lines.append(f" SESSION_LU_NAME={lu_name}")
 
-        print(f" SESSION_CODE_PAGE={tns.codec_info[0].name}")
-        print(f" SESSION_PS_SIZE={tns.amaxrow}x{tns.amaxcol}")
+        lines.append(f" SESSION_CODE_PAGE={tns.codec_info[0].name}")
+        lines.append(f" SESSION_PS_SIZE={tns.amaxrow}x{tns.amaxcol}")
 
         if tns.secure:
             verify = ""
@@ -784,29 +758,31 @@ class Zti(cmd.Cmd):
             session_ssl = int(not tns.start_tls_completed)
             if verify:
                 if not session_ssl:
-                    print(f" SESSION_SSL=0")
+                    lines.append(f" SESSION_SSL=0")
 
-                print(f" SESSION_SSL_VERIFY={verify}")
+                lines.append(f" SESSION_SSL_VERIFY={verify}")
             else:
                 if session_ssl:
-                    print(f" SESSION_SSL=1")
+                    lines.append(f" SESSION_SSL=1")
 
-                print(f" SESSION_SSL_VERIFY=none")
+                lines.append(f" SESSION_SSL_VERIFY=none")
         else:
-            print(f" SESSION_SSL=NEVER")
+            lines.append(f" SESSION_SSL=NEVER")
 
-        print(f" SESSION_TN_ENHANCED={tns.tn3270e:d}")
-        print(f" SESSION_DEVICE_TYPE={tns.terminal_type}")
+        lines.append(f" SESSION_TN_ENHANCED={tns.tn3270e:d}")
+        lines.append(f" SESSION_DEVICE_TYPE={tns.terminal_type}")
 
         if tns.alt:
-            print(" Alternate code page IBM-"+str(tns.cp_F1))
+            lines.append(" Alternate code page IBM-"+str(tns.cp_F1))
         else:
-            print(" Alternate code page not supported")
+            lines.append(" Alternate code page not supported")
 
         if tns.extended_color_mode():
-            print(" Extended color mode")
+            lines.append(" Extended color mode")
         else:
-            print(" Basic color mode")
+            lines.append(" Basic color mode")
+
+        print("\n".join(lines))
 
     def do_set(self, arg):
         """Set the value of an ATI-like variable.
@@ -819,8 +795,9 @@ class Zti(cmd.Cmd):
 
         self.__bg_wait_end()
 
-        name = rexx.word(arg, 1)
-        value = rexx.subword(arg, 2)
+        args = arg.split(maxsplit=1)
+        name = args[0] if args else ""
+        value = args[1].rstrip() if len(args) > 1 else ""
         ati.set(name, value)
         if self.single_session:
             sessions = ati.ati.sessions
@@ -893,7 +870,7 @@ class Zti(cmd.Cmd):
 
         try:
             with open(os.path.expanduser(arg)) as myfile:
-                self.cmdqueue += myfile.readlines()
+                self.cmdqueue.extend(myfile)
 
         except FileNotFoundError:
             if not default_rcfile:
@@ -909,48 +886,41 @@ class Zti(cmd.Cmd):
         if not tns:
             return
 
+        buffer_size = tns.buffer_size
+        plane_fa = tns.plane_fa
+        plane_eh = tns.plane_eh
+        plane_fg = tns.plane_fg
+        plane_bg = tns.plane_bg
         faddr, _ = tns.next_field(0, offset=0)
         if faddr < 0:
             faddr = 0
             sa0 = 0
             ea0 = 0
         else:
-            sa0 = (faddr + 1) % tns.buffer_size
+            sa0 = (faddr + 1) % buffer_size
             ea0 = sa0
 
-        print("adr1" +
-              "-adr2" +
-              " eh" +
-              " fg" +
-              " bg" +
-              " field attribute or text")
+        lines = ["adr1-adr2 eh fg bg field attribute or text"]
         for sa1, ea1 in tns.char_addrs(sa0, ea0):
             if faddr < 0:
                 faddr = 0
             else:
-                faddr = (sa1 - 1) % tns.buffer_size
-
-            fav = tns.plane_fa[faddr]
-            feh = tns.plane_eh[faddr]
-            ffg = tns.plane_fg[faddr]
-            fbg = tns.plane_bg[faddr]
-            print(rexx.right(str(faddr), 4) +
-                  "-"+rexx.right(str(ea1), 4) +
-                  " "+rexx.right(rexx.substr(hex(feh), 3), 2, "0") +
-                  " "+rexx.right(rexx.substr(hex(ffg), 3), 2, "0") +
-                  " "+rexx.right(rexx.substr(hex(fbg), 3), 2, "0") +
-                  " "+rexx.right(rexx.substr(hex(fav), 3), 2, "0") +
-                  " ("+tns.fav_repr(fav)+")")
+                faddr = (sa1 - 1) % buffer_size
+
+            fav = plane_fa[faddr]
+            hexs = bytes((plane_eh[faddr], plane_fg[faddr],
+                          plane_bg[faddr], fav)).hex()
+            lines.append(f"{faddr:4d}-{ea1:4d}"
+                         f" {hexs[0:2]} {hexs[2:4]} {hexs[4:6]}"
+                         f" {hexs[6:8]} ({tns.fav_repr(fav)})")
             for sa2, ea2 in tns.group_addrs(sa1, ea1):
-                ceh = tns.plane_eh[sa2]
-                cfg = tns.plane_fg[sa2]
-                cbg = tns.plane_bg[sa2]
-                print(rexx.right(str(sa2), 4) +
-                      "-"+rexx.right(str(ea2), 4) +
-                      " "+rexx.right(rexx.substr(hex(ceh), 3), 2, "0") +
-                      " "+rexx.right(rexx.substr(hex(cfg), 3), 2, "0") +
-                      " "+rexx.right(rexx.substr(hex(cbg), 3), 2, "0") +
-                      " "+repr(tns.scrstr(sa2, ea2).rstrip()))
+                hexs = bytes((plane_eh[sa2], plane_fg[sa2],
+                              plane_bg[sa2])).hex()
+                lines.append(f"{sa2:4d}-{ea2:4d}"
+                             f" {hexs[0:2]} {hexs[2:4]} {hexs[4:6]}"
+                             f" {tns.scrstr(sa2, ea2).rstrip()!r}")
+
+        print("\n".join(lines))
 
     def do_timeout(self, arg):
         """Timeout current wait in program.
@@ -991,7 +961,9 @@ class Zti(cmd.Cmd):
             return
 
         try:
-            file = open(os.path.expanduser(arg), mode="rb")
+            # tnz reads one get record at a time, buffer more
+            file = open(os.path.expanduser(arg), mode="rb",
+                        buffering=100*1024)
 
         except FileNotFoundError:
             print(">>> Upload file "+repr(arg)+" not found.")
@@ -1041,7 +1013,8 @@ class Zti(cmd.Cmd):
 
         buffer_size = tns.buffer_size
         epos = addr + 1  # next position
-        addr1 = (epos) % buffer_size  # next address
+        # next address
+        addr1 = epos if epos < buffer_size else epos - buffer_size
         self.__write_blanks(tns, addr, addr1)
         self.__clean_range(addr, epos)
         eaddr, _ = tns.next_field(addr)
@@ -1196,8 +1169,14 @@ HELP KEYS commands for more information.
         if line == "EOF":  # Ctrl+D pressed or end of input
             return line
 
-        cmd = rexx.word(line, 1)
-        return line.replace(cmd, cmd.lower(), 1)
+        stripped = line.lstrip()
+        if not stripped:
+            return line
+
+        lead = len(line) - len(stripped)
+        cmd = stripped.split(maxsplit=1)[0]
+        end = lead + len(cmd)
+        return line[:lead] + cmd.lower() + line[end:]
 
     def preloop(self):
         """Override cmd.Cmd.preloop
@@ -1210,7 +1189,7 @@ HELP KEYS commands for more information.
     def print_stack(self, exc=False):
         self.__shell_mode()
         try:
-            current_tb_count = len(traceback.extract_stack())
+            current_tb_count = self.__stack_depth()
             limit = current_tb_count - self.__tb_count
             if limit <= 1:
                 limit = None
@@ -1386,13 +1365,17 @@ HELP and HELP KEYS commands for more information.
         if dlen >= buffer_size:
             return
 
+        # dlen < buffer_size, so a single subtract wraps addresses
+        saddr = daddr + dlen
+        if saddr >= buffer_size:
+            saddr -= buffer_size
+
         if faddr1 != daddr:  # if first char not wiping out field
-            caddr2 = (daddr+dlen-1) % buffer_size
+            caddr2 = saddr - 1 if saddr else buffer_size - 1
             faddr2, _ = tns.field(caddr2)
             if faddr1 == faddr2:  # if no fields being wiped
                 return
 
-        saddr = (daddr+dlen) % buffer_size
         eaddr, _ = tns.next_field(saddr, daddr)
         if eaddr < 0:
             self.__dirty_range(saddr, daddr, tns=tns)
@@ -1443,24 +1426,26 @@ HELP and HELP KEYS commands for more information.
         if start >= end:
             raise ValueError(f"{start} >= {end}")
 
-        for i, (sidx, eidx) in enumerate(self.__dirty_ranges):
-            if start == sidx and end == eidx:
-                self.__dirty_ranges.pop(i)
-                return
+        # dirty ranges overlapping start to end are ranges[i:j]
+        ranges = self.__dirty_ranges
+        i = bisect.bisect_left(ranges, (start,))
+        if i and ranges[i-1][1] > start:
+            i -= 1
 
-            if start <= sidx and end >= eidx:
-                self.__dirty_ranges.pop(i)
+        j = bisect.bisect_left(ranges, (end,), i)
+        if i == j:
+            return
 
-            elif start <= sidx and end > sidx:
-                self.__dirty_ranges[i] = (end, eidx)
+        remains = []
+        sidx = ranges[i][0]
+        if sidx < start:
+            remains.append((sidx, start))
 
-            elif start < eidx and end >= eidx:
-                self.__dirty_ranges[i] = (sidx, start)
+        eidx = ranges[j-1][1]
+        if eidx > end:
+            remains.append((end, eidx))
 
-            elif start > sidx and end < eidx:
-                self.__dirty_ranges[i] = (sidx, start)
-                self.__dirty_ranges.append((end, eidx))
-                return
+        ranges[i:j] = remains
 
     def __color_setup(self):
         if self.__has_color is True:
@@ -1483,6 +1468,21 @@ HELP and HELP KEYS commands for more information.
 
             self.__has_color = False
 
+    def __complete(self, text, line, names):
+        """Return completions for text from the input upper case
+        names. The completed part matches the case of the line.
+        """
+        textu = text.upper()
+        textl = len(text)
+        tails = [name[textl:] for name in names
+                 if name.startswith(textu)]
+        if line.islower():
+            tails = map(str.lower, tails)
+        elif line.isupper():
+            tails = map(str.upper, tails)
+
+        return [text + tail for tail in tails]
+
     def __dirty_range(self, start, end, tns=None):
         """Mark a range of screen addresses as dirty.
 
@@ -1505,27 +1505,20 @@ HELP and HELP KEYS commands for more information.
             self.__dirty_range(start, tns.buffer_size)
             return
 
-        start1 = start
-        end1 = end
-        for i, (sidx, eidx) in enumerate(self.__dirty_ranges):
-            if start >= sidx and end <= eidx:
-                return
+        # The dirty ranges are kept sorted and do not overlap or
+        # touch. Ranges that overlap or touch start to end are
+        # ranges[i:j] and are merged with it.
+        ranges = self.__dirty_ranges
+        i = bisect.bisect_left(ranges, (start,))
+        if i and ranges[i-1][1] >= start:
+            i -= 1
 
-            if start <= sidx and end >= eidx:
-                self.__dirty_ranges.pop(i)
+        j = bisect.bisect_left(ranges, (end + 1,), i)
+        if i < j:
+            start = min(start, ranges[i][0])
+            end = max(end, ranges[j-1][1])
 
-            elif start <= sidx and end >= sidx:
-                self.__dirty_ranges.pop(i)
-                end1 = eidx
-
-            elif start <= eidx and end >= eidx:
-                self.__dirty_ranges.pop(i)
-                start1 = sidx
-
-        if start1 != start or end1 != end:
-            return self.__dirty_range(start1, end1)
-
-        self.__dirty_ranges.append((start, end))
+        ranges[i:j] = [(start, end)]
 
     def __display(self, window, showcursor):
         _logger.debug("begin __display")
@@ -1540,6 +1533,24 @@ HELP and HELP KEYS commands for more information.
 
         session = ati.ati.session
         tns = ati.ati.get_tnz()
+        header_cursor_at = self.__header_cursor_at
+        if (header_cursor_at and header_cursor_at[0] is tns and
+                not (rewrite_keylock or rewrite_status or
+                     self.__dirty_ranges or tns.ddm_in_progress())):
+            # only the cursor moved, layout is unchanged
+            _, hy, hx, rlen, clen = header_cursor_at
+            maxcol = tns.maxcol
+            currow = tns.curadd // maxcol + 1
+            curcol = tns.curadd % maxcol + 1
+            if (currow, curcol) != self.__header_cursor:
+                self.__header_cursor = (currow, curcol)
+                self.__tty_write(hy, hx,
+                                 f"{currow:>{rlen}},{curcol:>{clen}}")
+
+            _logger.debug("end __display (cursor only)")
+            return
+
+        self.__header_cursor_at = None
         has_color = min(tns.colors, self.colors) >= 8
 
         # Determine where host screen will displayed and what fits
@@ -1558,23 +1569,13 @@ HELP and HELP KEYS commands for more information.
             # the aspect ratio
             arows, acols = self.autosize
             aspect1 = arows / acols
-            srows, scols = self.__scale_size(maxrow, maxcol)
-            sr2, sc2 = self.__scale_size(maxrow, maxcol + 9)
-            sr3, sc3 = self.__scale_size(maxrow + 4, maxcol)
-            sr4, sc4 = self.__scale_size(maxrow + 4, maxcol + 9)
-            rat = srows / scols
-            rat2 = sr2 / sc2
-            rat3 = sr3 / sc3
-            rat4 = sr4 / sc4
-            if abs(aspect1-rat2) < abs(aspect1-rat):
-                srows, scols = sr2, sc2
-                rat = rat2
-            if abs(aspect1-rat3) < abs(aspect1-rat):
-                srows, scols = sr3, sc3
-                rat = rat3
-            if abs(aspect1-rat4) < abs(aspect1-rat):
-                srows, scols = sr4, sc4
-                rat = rat4
+            # closest ratio wins, first listed on a tie
+            sizes = (self.__scale_size(maxrow, maxcol),
+                     self.__scale_size(maxrow, maxcol + 9),
+                     self.__scale_size(maxrow + 4, maxcol),
+                     self.__scale_size(maxrow + 4, maxcol + 9))
+            srows, scols = min(sizes, key=lambda size:
+                               abs(aspect1 - size[0] / size[1]))
 
             curses.prog_maxyx = srows, scols
 
@@ -1663,10 +1664,10 @@ HELP and HELP KEYS commands for more information.
 
             _logger.debug("before drawing header/footer")
             keylock = ati.value("KEYLOCK", trace=False)
-            dashes = rexx.copies("\u2500", min(cols, maxcol))
+            hline_len = min(cols, maxcol)
 
             if rewrite:
-                window.hline(ypos - 3, xpos, acs_hline, len(dashes))
+                window.hline(ypos - 3, xpos, acs_hline, hline_len)
 
             if tns.ddm_in_progress():
                 statlen = 42
@@ -1687,62 +1688,77 @@ HELP and HELP KEYS commands for more information.
                     msg = rexx.left(msg, statlen)
                     self.__tty_write(ypos - 2, xpos, msg)
                     window.attroff(curses.A_REVERSE)
+                    self.__header_cursor = None  # overwritten
+                    self.__header_keylock = None
+
+                if rewrite:
+                    self.__tty_write(", Session= ")
+                    self.__tty_write(rexx.left(session, 12))
 
                 tsx = xpos + statlen
             else:
-                if rewrite or rewrite_status:
-                    self.__tty_write(ypos - 2, xpos, "Cursor= (")
-
                 rlen = len(str(maxrow))
                 clen = len(str(maxcol))
-                if rewrite or rewrite_cursor or rewrite_status:
-                    self.__tty_write(ypos-2, xpos+9,
-                                     rexx.right(str(currow), rlen) +
-                                     "," +
-                                     rexx.right(str(curcol), clen))
-
-                tsx = xpos + 9 + clen + 1 + rlen
+                # "Cursor= (r,c), Size= (r,c), " precedes the keylock
+                ktsx = xpos + 9 + rlen + 1 + clen
+                ktsx += 10 + rlen + 1 + clen + 3
+                tsx = ktsx + 10
+                self.__header_cursor_at = (tns, ypos-2, xpos+9,
+                                           rlen, clen)
                 if rewrite or rewrite_status:
-                    self.__tty_write(ypos-2, tsx,
-                                     "), Size= (" +
-                                     rexx.right(str(maxrow), rlen) +
-                                     "," +
-                                     rexx.right(str(maxcol), clen) +
-                                     "), ")
-
-                tsx += 10 + rlen + 1 + clen + 3
-                if rewrite or rewrite_status or rewrite_keylock:
+                    # one write for the whole line, then redo keylock
+                    line = (f"Cursor= ({currow:>{rlen}},"
+                            f"{curcol:>{clen}}), Size= ("
+                            f"{maxrow:>{rlen}},{maxcol:>{clen}}), "
+                            f"KeyLock= {keylock}")
+                    if rewrite:
+                        line += f", Session= {session:<12.12}"
+
+                    self.__tty_write(ypos-2, xpos, line)
                     if "1" == keylock:
                         window.attron(curses.A_REVERSE)
-                    self.__tty_write(ypos-2, tsx,
-                                     "KeyLock= "+keylock)
-                    if "1" == keylock:
+                        self.__tty_write(ypos-2, ktsx, "KeyLock= 1")
                         window.attroff(curses.A_REVERSE)
 
-                tsx += 10
-
-            if rewrite:
-                self.__tty_write(", Session= ")
-                self.__tty_write(rexx.left(session, 12))
+                    self.__header_cursor = (currow, curcol)
+                    self.__header_keylock = keylock
+                else:
+                    # skip cursor and keylock text that is already shown
+                    if (rewrite_cursor and
+                            (currow, curcol) != self.__header_cursor):
+                        self.__header_cursor = (currow, curcol)
+                        self.__tty_write(ypos-2, xpos+9,
+                                         f"{currow:>{rlen}},"
+                                         f"{curcol:>{clen}}")
+
+                    if (rewrite_keylock and
+                            keylock != self.__header_keylock):
+                        self.__header_keylock = keylock
+                        if "1" == keylock:
+                            window.attron(curses.A_REVERSE)
+                        self.__tty_write(ypos-2, ktsx,
+                                         "KeyLock= "+keylock)
+                        if "1" == keylock:
+                            window.attroff(curses.A_REVERSE)
 
             tsx += 23
             if rewrite or rewrite_status:
                 self.__tty_write(ypos-2, tsx, ati.ati.time)
 
             if rewrite:
-                window.hline(ypos-1, xpos, acs_hline, len(dashes))
+                window.hline(ypos-1, xpos, acs_hline, hline_len)
 
                 if (row1 + maxrow) <= rows:  # if room for footer
-                    window.hline(endy, xpos, acs_hline, len(dashes))
+                    window.hline(endy, xpos, acs_hline, hline_len)
 
             _logger.debug("after drawing header/footer")
 
         # Draw 3270 terminal screen
 
+        buffer_size = tns.buffer_size
         dirty_ranges = self.__dirty_ranges
         if dirty_ranges:
             if not rewrite:
-                buffer_size = tns.buffer_size
                 for sidx, eidx in dirty_ranges:
                     eidx %= buffer_size
                     faddr, _ = tns.field(sidx)
@@ -1753,7 +1769,7 @@ HELP and HELP KEYS commands for more information.
 
         if rewrite:
             _logger.debug("before drawing terminal")
-            faddr, _ = tns.next_field(tns.buffer_size-2)
+            faddr, _ = tns.next_field(buffer_size-2)
             if faddr < 0:  # if no fields
                 self.write(tns, 0, 0, 0)
             else:
@@ -1765,7 +1781,7 @@ HELP and HELP KEYS commands for more information.
 
                     self.__write_blanks(tns, paddr, saddr)
                     paddr = eaddr
-                    faddr = (saddr-1) % tns.buffer_size
+                    faddr = saddr - 1 if saddr else buffer_size - 1
                     self.write(tns, faddr, saddr, eaddr)
 
                 self.__write_blanks(tns, paddr, xaddr)
@@ -1775,25 +1791,41 @@ HELP and HELP KEYS commands for more information.
         _logger.debug("end __display")
 
     def __install_plugins(self):
-        try:
-            from importlib.metadata import entry_points
-        except ImportError:  # must be Python <3.8
-            self.plugins = ""
-            return
+        zti_plugins = Zti._zti_commands
+        if zti_plugins is None:
+            # scan installed distributions once per process
+            try:
+                from importlib.metadata import entry_points
+            except ImportError:  # must be Python <3.8
+                zti_plugins = ()
+            else:
+                eps = entry_points()
+                if hasattr(eps, "select"):
+                    zti_plugins = eps.select(group="zti.commands")
+                else:
+                    zti_plugins = eps.get("zti.commands", [])
 
-        plugins = []
-        eps = entry_points()
-        if hasattr(eps, "select"):
-            zti_plugins = eps.select(group="zti.commands")
-        else:
-            zti_plugins = eps.get("zti.commands", [])
+                zti_plugins = tuple(zti_plugins)
 
+            Zti._zti_commands = zti_plugins
+
+        loaded = {}  # entry point name -> loaded plugin
+
+        def load_plugin(entry):
+            plugin = loaded.get(entry.name)
+            if plugin is None:
+                plugin = entry.load()
+                loaded[entry.name] = plugin
+
+            return plugin
+
+        plugins = []
         for entry in zti_plugins:
             name = entry.name
             plugins.append(name)
 
             def do_plugin(arg, entry=entry, **kwargs):
-                plugin = entry.load()
+                plugin = load_plugin(entry)
                 self.__bg_wait_end()
                 tb_count = self.__tb_count
                 plugin_goto = self.__plugin_goto
@@ -1802,7 +1834,7 @@ HELP and HELP KEYS commands for more information.
                 self.__plugin_kwargs.clear()
                 try:
                     try:
-                        self.__tb_count = len(traceback.extract_stack())
+                        self.__tb_count = self.__stack_depth()
                     except Exception:
                         pass
 
@@ -1829,7 +1861,7 @@ HELP and HELP KEYS commands for more information.
                         ati.ati.session = sessions[0]
 
             def help_plugin(entry=entry):
-                plugin = entry.load()
+                plugin = load_plugin(entry)
                 self.__shell_mode()
                 plugin("--help")
 
@@ -2089,20 +2121,22 @@ HELP and HELP KEYS commands for more information.
                         (cstr and cstr.startswith("ALT_") and
                          len(cstr) == 5 and
                          str.isalpha(cstr[-1]))):
-                        maxcol = tns.maxcol
                         alet1 = cstr[-1].lower()
                         alet2 = alet1.upper()
                         elet1 = tns.codec_info[0].encode(alet1)[0][0]
                         elet2 = tns.codec_info[0].encode(alet2)[0][0]
-                        for i in range(0, maxcol):
-                            if ((tns.plane_dc[i] != elet1 and
-                                 tns.plane_dc[i] != elet2)):
-                                continue
-
-                            exn = tns.plane_eh[i]
-                            if (exn & 0x0C0) == 0x0C0:  # if underline
-                                altc = i+1
-                                break
+                        # first underlined letter in the top row
+                        top_dc = tns.plane_dc[:tns.maxcol]
+                        plane_eh = tns.plane_eh
+                        for elet in (elet1, elet2):
+                            i = top_dc.find(elet)
+                            while i >= 0 and (not altc or i < altc):
+                                exn = plane_eh[i]
+                                if (exn & 0x0C0) == 0x0C0:  # underline
+                                    altc = i+1
+                                    break
+
+                                i = top_dc.find(elet, i+1)
 
                 # process input
 
@@ -2209,63 +2243,6 @@ HELP and HELP KEYS commands for more information.
                         else:
                             self.__key_data(tns, cstr)
 
-                elif cstr == "\r":
-                    _logger.debug("keyed Enter")
-                    aid_callable = tns.enter
-
-                elif cstr == "\n":
-                    _logger.debug("keyed Shift+Enter")
-                    # TODO need to handle keylock
-                    tns.key_newline()
-
-                elif cstr == "\t":
-                    _logger.debug("keyed Tab")
-                    # TODO need to handle keylock
-                    tns.key_tab(zti=self)
-                    self.rewrite_cursor = True
-
-                elif (cstr == "\b" or
-                      cstr == "KEY_BACKSPACE" or
-                      cstr == "\x7f"):
-                    _logger.debug("keyed Backspace")
-                    # TODO need to handle keylock
-                    tns.key_backspace(zti=self)
-                    self.rewrite_cursor = True
-
-                elif (cstr == "\x0b" or  # Ctrl+K
-                      cstr == "\x1b[4~" or  # Shift+End
-                      cstr == "\x1b[F" or  # Shift+End
-                      cstr == "KEY_SEND"):  # Shift+End
-                    _logger.debug("keyed Shift+End or Ctrl+K")
-                    # TODO need to handle keylock
-                    tns.key_eraseeof(zti=self)
-
-                elif cstr == "KEY_END":  # End
-                    _logger.debug("keyed End")
-                    # TODO need to handle keylock
-                    tns.key_end()
-                    self.rewrite_cursor = True
-
-                elif (cstr == "\x1b[1~" or
-                      cstr == "\x1b H" or
-                      cstr == "KEY_HOME"):
-                    _logger.debug("keyed Home")
-                    # TODO need to handle keylock
-                    tns.key_home(zti=self)
-                    self.rewrite_cursor = True
-
-                elif cstr == "KEY_DC":
-                    _logger.debug("keyed Delete")
-                    # TODO need to handle keylock
-                    tns.key_delete(zti=self)
-
-                elif (cstr == "KEY_BTAB" or  # Shift+Tab
-                      cstr == "\x1b[~"):  # Shift+Tab Windows->ssh
-                    _logger.debug("keyed Shift+Tab")
-                    # TODO need to handle keylock
-                    tns.key_backtab(zti=self)
-                    self.rewrite_cursor = True
-
                 elif altc > 0:
 
                     if tns.pwait or tns.system_lock_wait:
@@ -2278,53 +2255,22 @@ HELP and HELP KEYS commands for more information.
                         self.rewrite_keylock = True
                         self.rewrite_cursor = True
 
-                elif cstr == "KEY_PPAGE":  # PgUp
-                    _logger.debug("keyed PgUp")
-                    aid_callable = tns.pf7
-
-                elif cstr == "KEY_NPAGE":  # PgDn
-                    _logger.debug("keyed PgDn")
-                    aid_callable = tns.pf8
-
-                elif cstr == "KEY_UP":
-                    _logger.debug("keyed Up")
-                    # TODO need to handle keylock
-                    tns.key_curup(zti=self)
-                    self.rewrite_cursor = True
-
-                elif cstr == "KEY_DOWN":
-                    _logger.debug("keyed Dn")
-                    # TODO need to handle keylock
-                    tns.key_curdown(zti=self)
-                    self.rewrite_cursor = True
-
-                elif cstr == "KEY_LEFT":
-                    _logger.debug("keyed Left")
-                    # TODO need to handle keylock
-                    tns.key_curleft(zti=self)
-                    self.rewrite_cursor = True
-
-                elif cstr == "KEY_RIGHT":
-                    _logger.debug("keyed Right")
+                elif cstr in _EDIT_KEYS:
+                    desc, name, pass_zti, moves = _EDIT_KEYS[cstr]
+                    _logger.debug("keyed %s", desc)
                     # TODO need to handle keylock
-                    tns.key_curright(zti=self)
-                    self.rewrite_cursor = True
+                    if pass_zti:
+                        getattr(tns, name)(zti=self)
+                    else:
+                        getattr(tns, name)()
 
-                elif cstr in ("\x1b\x1b[D",  # Alt+LEFT
-                              "\x1bb",  # Alt+LEFT (Terminal.app)
-                              "\x1b[1;3D"):  # Alt+LEFT (Windows)
-                    _logger.debug("keyed Alt+Left")
-                    # TODO need to handle keylock
-                    tns.key_word_left()
-                    self.rewrite_cursor = True
+                    if moves:
+                        self.rewrite_cursor = True
 
-                elif cstr in ("\x1b\x1b[C",  # Alt+RIGHT
-                              "\x1bf",  # Alt+RIGHT (Terminal.app)
-                              "\x1b[1;3C"):  # Alt+RIGHT (Windows)
-                    _logger.debug("keyed Alt+Right")
-                    # TODO need to handle keylock
-                    tns.key_word_right()
-                    self.rewrite_cursor = True
+                elif cstr in _AID_KEYS:
+                    desc, name = _AID_KEYS[cstr]
+                    _logger.debug("keyed %s", desc)
+                    aid_callable = getattr(tns, name)
 
                 elif cstr == "KEY_IC":
                     _logger.debug("keyed Insert")
@@ -2349,18 +2295,6 @@ HELP and HELP KEYS commands for more information.
                         tns.pa1()
                         self.rewrite_keylock = True
 
-                elif (cstr == "\x1b2" or  # ESC+2 (Alt+2)
-                      cstr == "ALT_2" or  # ESC+2 (Alt+2)
-                      cstr == "\x1b\x1b[1~" or  # ESC+Home (Alt+Home)
-                      cstr == "ALT_HOME"):  # Alt+Home
-                    _logger.debug("keyed Alt+2 or Alt+Home")
-                    aid_callable = tns.pa2
-
-                elif (cstr == "\x1b3" or  # ESC+3 (Alt+3)
-                      cstr == "ALT_3"):  # ESC+3 (Alt+3)
-                    _logger.debug("keyed Alt+3")
-                    aid_callable = tns.pa3
-
                 elif (cstr == "\x1ba" or  # ESC+a (Alt+A)
                       cstr == "ALT_A" or  # ESC+a (Alt+A)
                       cstr == "\x03"):  # Ctrl+C
@@ -2368,119 +2302,6 @@ HELP and HELP KEYS commands for more information.
                     keylock_aidbuf.clear()
                     tns.attn()
 
-                elif (cstr == "\x1bc" or  # ESC+c (Alt+c)
-                      cstr == "ALT_C"):  # ESC+c (Alt+c)
-                    _logger.debug("keyed Alt+C")
-                    aid_callable = tns.clear
-
-                elif (cstr == "KEY_F(1)" or
-                      cstr == "\x1b[11~"):
-                    _logger.debug("keyed F1")
-                    aid_callable = tns.pf1
-
-                elif (cstr == "KEY_F(2)" or
-                      cstr == "\x1b[12~"):
-                    _logger.debug("keyed F2")
-                    aid_callable = tns.pf2
-
-                elif (cstr == "KEY_F(3)" or
-                      cstr == "\x1b[13~"):
-                    _logger.debug("keyed F3")
-                    aid_callable = tns.pf3
-
-                elif (cstr == "KEY_F(4)" or
-                      cstr == "\x1b[14~"):
-                    _logger.debug("keyed F4")
-                    aid_callable = tns.pf4
-
-                elif cstr == "KEY_F(5)":
-                    _logger.debug("keyed F5")
-                    aid_callable = tns.pf5
-
-                elif cstr == "KEY_F(6)":
-                    _logger.debug("keyed F6")
-                    aid_callable = tns.pf6
-
-                elif cstr == "KEY_F(7)":
-                    _logger.debug("keyed F7")
-                    aid_callable = tns.pf7
-
-                elif cstr == "KEY_F(8)":
-                    _logger.debug("keyed F8")
-                    aid_callable = tns.pf8
-
-                elif cstr == "KEY_F(9)":
-                    _logger.debug("keyed F9")
-                    aid_callable = tns.pf9
-
-                elif cstr == "KEY_F(10)":
-                    _logger.debug("keyed F10")
-                    aid_callable = tns.pf10
-
-                elif cstr == "KEY_F(11)":
-                    _logger.debug("keyed F11")
-                    aid_callable = tns.pf11
-
-                elif cstr == "KEY_F(12)":
-                    _logger.debug("keyed F12")
-                    aid_callable = tns.pf12
-
-                elif cstr == "KEY_F(13)":
-                    _logger.debug("keyed Shift+F1")
-                    aid_callable = tns.pf13
-
-                elif cstr == "KEY_F(14)":
-                    _logger.debug("keyed Shift+F2")
-                    aid_callable = tns.pf14
-
-                elif (cstr == "KEY_F(15)" or  # Shift+F3
-                      cstr == "\x1b[25~"):  # Shift+F3
-                    _logger.debug("keyed Shift+F3")
-                    aid_callable = tns.pf15
-
-                elif (cstr == "KEY_F(16)" or  # Shift+F4
-                      cstr == "\x1b[26~"):  # Shift+F4
-                    _logger.debug("keyed Shift+F4")
-                    aid_callable = tns.pf16
-
-                elif (cstr == "KEY_F(17)" or  # Shift+F5
-                      cstr == "\x1b[28~"):  # Shift+F5
-                    _logger.debug("keyed Shift+F5")
-                    aid_callable = tns.pf17
-
-                elif (cstr == "KEY_F(18)" or  # Shift+F6
-                      cstr == "\x1b[29~"):  # Shift+F6
-                    _logger.debug("keyed Shift+F6")
-                    aid_callable = tns.pf18
-
-                elif (cstr == "KEY_F(19)" or  # Shift+F7
-                      cstr == "\x1b[31~"):  # Shift+F7
-                    _logger.debug("keyed Shift+F7")
-                    aid_callable = tns.pf19
-
-                elif (cstr == "KEY_F(20)" or  # Shift+F8
-                      cstr == "\x1b[32~"):  # Shift+F8
-                    _logger.debug("keyed Shift+F8")
-                    aid_callable = tns.pf20
-
-                elif (cstr == "KEY_F(21)" or  # Shift+F9
-                      cstr == "\x1b[33~"):  # Shift+F9
-                    _logger.debug("keyed Shift+F9")
-                    aid_callable = tns.pf21
-
-                elif (cstr == "KEY_F(22)" or  # Shift+F10
-                      cstr == "\x1b[34~"):  # Shift+F10
-                    _logger.debug("keyed Shift+F10")
-                    aid_callable = tns.pf22
-
-                elif cstr == "KEY_F(23)":
-                    _logger.debug("keyed Shift+F11")
-                    aid_callable = tns.pf23
-
-                elif cstr == "KEY_F(24)":
-                    _logger.debug("keyed Shift+F12")
-                    aid_callable = tns.pf24
-
                 elif (cstr == "\x1b\x1b[5~" or  # Alt+PgUp Putty
                       cstr == "\x1b[5;3~" or  # Alt+PgUp Git Bash
                       cstr == "kPRV3" or      # Alt_PgUp Windows->ssh
@@ -3133,13 +2954,14 @@ HELP and HELP KEYS commands for more information.
         else:
             attr = curses.A_NORMAL
 
+        maxcol = tns.maxcol
         for rsp, rep in tns.iterow(saddr, eaddr):
-            absy = rsp // tns.maxcol
+            absy = rsp // maxcol
             if absy < ypos1 or absy >= ypos2:
                 continue
 
-            gsx = rsp % tns.maxcol
-            gex = (rep-1) % tns.maxcol
+            gsx = rsp % maxcol
+            gex = (rep-1) % maxcol
             if gex < xpos1 or gsx >= xpos2:
                 continue
 
@@ -3174,12 +2996,13 @@ HELP and HELP KEYS commands for more information.
         xpos2, ypos2 = self.twin_end
         xpos, ypos = self.twin_loc
 
-        absy = caddr1 // tns.maxcol
+        maxcol = tns.maxcol
+        absy = caddr1 // maxcol
         if absy < ypos1 or absy >= ypos2:
             return
 
-        gsx = caddr1 % tns.maxcol
-        gex = (endpos - 1) % tns.maxcol
+        gsx = caddr1 % maxcol
+        gex = (endpos - 1) % maxcol
         if gex < xpos1 or gsx >= xpos2:
             return
 
@@ -3215,15 +3038,18 @@ HELP and HELP KEYS commands for more information.
         f_intensified = tns.is_intensified_attr(fattr)
         f_normal = tns.is_normal_attr(fattr)
 
-        f_eh = tns.plane_eh[faddr]
-        f_fg = tns.plane_fg[faddr]
-        f_bg = tns.plane_bg[faddr]
+        plane_eh = tns.plane_eh
+        plane_fg = tns.plane_fg
+        plane_bg = tns.plane_bg
+        f_eh = plane_eh[faddr]
+        f_fg = plane_fg[faddr]
+        f_bg = plane_bg[faddr]
 
         # Determine attributes - get character attributes
 
-        c_eh = tns.plane_eh[caddr1]
-        c_fg = tns.plane_fg[caddr1]
-        c_bg = tns.plane_bg[caddr1]
+        c_eh = plane_eh[caddr1]
+        c_fg = plane_fg[caddr1]
+        c_bg = plane_bg[caddr1]
 
         # Determine attributes - combine attributes
 
@@ -3444,33 +3270,46 @@ HELP and HELP KEYS commands for more information.
 
     # Internal static methods
 
+    @staticmethod
+    def _receive_ascii(file, file2, size=65536):
+        """Copy downloaded ascii data from file to text file2
+
+        CRLF becomes LF and a trailing x1A (EOF) is dropped.
+        """
+        # Convert in chunks. The last byte is held back for the
+        # end-of-file check, and a CR is held back with it so that
+        # a CRLF is never split between chunks.
+        bstr = b""
+        while True:
+            chunk = file.read(size)
+            if not chunk:
+                break
+
+            bstr += chunk
+            keep = -2 if bstr[-2:-1] == b'\r' else -1
+            cstr = bstr[:keep].replace(b'\r\n', b'\n')
+            file2.write(cstr.decode('iso8859-1'))  # ?
+            bstr = bstr[keep:]
+
+        if bstr.endswith(b'\x1a'):
+            bstr = bstr[:-1]
+
+        bstr = bstr.replace(b'\r\n', b'\n')
+        file2.write(bstr.decode('iso8859-1'))  # ?
+
     @staticmethod
     def _rows_cols(session_ps_size):
         """rows, cols for SESSION_PS_SIZE value
         """
-        if session_ps_size == "MAX":
-            columns, lines = os.get_terminal_size()
-            lines -= 4
-            columns = min(columns - 19, 160)
-            return _util.session_ps_14bit(lines, columns)
-
-        if session_ps_size == "MAX255":
-            columns, lines = os.get_terminal_size()
-            lines -= 4
-            columns = max(columns - 19, 255)
-            return _util.session_ps_14bit(lines, columns)
-
-        if session_ps_size == "FULL":
-            columns, lines = os.get_terminal_size()
-            columns = min(columns, 160)  # 160 for ispf
-            return _util.session_ps_14bit(lines, columns)
-
-        if session_ps_size == "FULL255":
-            columns, lines = os.get_terminal_size()
-            columns = min(columns, 255)
-            return _util.session_ps_14bit(lines, columns)
-
-        return _util.session_ps_size(session_ps_size)
+        rule = _PS_SIZE_RULES.get(session_ps_size)
+        if not rule:
+            return _util.session_ps_size(session_ps_size)
+
+        lines_trim, columns_trim, bound, columns_bound = rule
+        columns, lines = os.get_terminal_size()
+        lines -= lines_trim
+        columns = bound(columns - columns_trim, columns_bound)
+        return _util.session_ps_14bit(lines, columns)
 
     # Private static methods
 
@@ -3483,10 +3322,26 @@ HELP and HELP KEYS commands for more information.
 
         return callback
 
+    @staticmethod
+    def __stack_depth():
+        """Return the number of frames in the stack of the caller.
+
+        Same as len(traceback.extract_stack()) in the caller, without
+        building the stack summary.
+        """
+        depth = 0
+        frame = sys._getframe(1)
+        while frame:
+            depth += 1
+            frame = frame.f_back
+
+        return depth
+
     # Internal data and other attributes
 
     _zti = None
     _stdscr = None
+    _zti_commands = None  # zti.commands entry points
 
 
 class _ZtiAbort(BaseException):
@@ -3594,5 +3449,89 @@ _WAIT_HOLDING = 7
 _WAIT_NOT_MORE = 8
 _WAIT_NOT_HOLDING = 9
 
+# terminal-relative SESSION_PS_SIZE values: lines to trim, columns
+# to trim, and how to bound the columns
+_PS_SIZE_RULES = {
+    "MAX": (4, 19, min, 160),
+    "MAX255": (4, 19, max, 255),
+    "FULL": (0, 0, min, 160),  # 160 for ispf
+    "FULL255": (0, 0, min, 255),
+    }
+
+# keys that call a tnz key_ method:
+# (description, method name, pass zti, moves cursor)
+_EDIT_KEYS = {cstr: value for cstrs, value in (
+    (("\n",), ("Shift+Enter", "key_newline", False, False)),
+    (("\t",), ("Tab", "key_tab", True, True)),
+    (("\b", "KEY_BACKSPACE", "\x7f"),
+     ("Backspace", "key_backspace", True, True)),
+    (("\x0b",  # Ctrl+K
+      "\x1b[4~",  # Shift+End
+      "\x1b[F",  # Shift+End
+      "KEY_SEND"),  # Shift+End
+     ("Shift+End or Ctrl+K", "key_eraseeof", True, False)),
+    (("KEY_END",), ("End", "key_end", False, True)),
+    (("\x1b[1~", "\x1b H", "KEY_HOME"),
+     ("Home", "key_home", True, True)),
+    (("KEY_DC",), ("Delete", "key_delete", True, False)),
+    (("KEY_BTAB",  # Shift+Tab
+      "\x1b[~"),  # Shift+Tab Windows->ssh
+     ("Shift+Tab", "key_backtab", True, True)),
+    (("KEY_UP",), ("Up", "key_curup", True, True)),
+    (("KEY_DOWN",), ("Dn", "key_curdown", True, True)),
+    (("KEY_LEFT",), ("Left", "key_curleft", True, True)),
+    (("KEY_RIGHT",), ("Right", "key_curright", True, True)),
+    (("\x1b\x1b[D",  # Alt+LEFT
+      "\x1bb",  # Alt+LEFT (Terminal.app)
+      "\x1b[1;3D"),  # Alt+LEFT (Windows)
+     ("Alt+Left", "key_word_left", False, True)),
+    (("\x1b\x1b[C",  # Alt+RIGHT
+      "\x1bf",  # Alt+RIGHT (Terminal.app)
+      "\x1b[1;3C"),  # Alt+RIGHT (Windows)
+     ("Alt+Right", "key_word_right", False, True)),
+    ) for cstr in cstrs}
+
+# keys that send an AID: (description, method name)
+_AID_KEYS = {cstr: value for cstrs, value in (
+    (("\r",), ("Enter", "enter")),
+    (("KEY_PPAGE",), ("PgUp", "pf7")),
+    (("KEY_NPAGE",), ("PgDn", "pf8")),
+    (("\x1b2",  # ESC+2 (Alt+2)
+      "ALT_2",  # ESC+2 (Alt+2)
+      "\x1b\x1b[1~",  # ESC+Home (Alt+Home)
+      "ALT_HOME"),  # Alt+Home
+     ("Alt+2 or Alt+Home", "pa2")),
+    (("\x1b3",  # ESC+3 (Alt+3)
+      "ALT_3"),  # ESC+3 (Alt+3)
+     ("Alt+3", "pa3")),
+    (("\x1bc",  # ESC+c (Alt+c)
+      "ALT_C"),  # ESC+c (Alt+c)
+     ("Alt+C", "clear")),
+    (("KEY_F(1)", "\x1b[11~"), ("F1", "pf1")),
+    (("KEY_F(2)", "\x1b[12~"), ("F2", "pf2")),
+    (("KEY_F(3)", "\x1b[13~"), ("F3", "pf3")),
+    (("KEY_F(4)", "\x1b[14~"), ("F4", "pf4")),
+    (("KEY_F(5)",), ("F5", "pf5")),
+    (("KEY_F(6)",), ("F6", "pf6")),
+    (("KEY_F(7)",), ("F7", "pf7")),
+    (("KEY_F(8)",), ("F8", "pf8")),
+    (("KEY_F(9)",), ("F9", "pf9")),
+    (("KEY_F(10)",), ("F10", "pf10")),
+    (("KEY_F(11)",), ("F11", "pf11")),
+    (("KEY_F(12)",), ("F12", "pf12")),
+    (("KEY_F(13)",), ("Shift+F1", "pf13")),
+    (("KEY_F(14)",), ("Shift+F2", "pf14")),
+    (("KEY_F(15)", "\x1b[25~"), ("Shift+F3", "pf15")),
+    (("KEY_F(16)", "\x1b[26~"), ("Shift+F4", "pf16")),
+    (("KEY_F(17)", "\x1b[28~"), ("Shift+F5", "pf17")),
+    (("KEY_F(18)", "\x1b[29~"), ("Shift+F6", "pf18")),
+    (("KEY_F(19)", "\x1b[31~"), ("Shift+F7", "pf19")),
+    (("KEY_F(20)", "\x1b[32~"), ("Shift+F8", "pf20")),
+    (("KEY_F(21)", "\x1b[33~"), ("Shift+F9", "pf21")),
+    (("KEY_F(22)", "\x1b[34~"), ("Shift+F10", "pf22")),
+    (("KEY_F(23)",), ("Shift+F11", "pf23")),
+    (("KEY_F(24)",), ("Shift+F12", "pf24")),
+    ) for cstr in cstrs}
+
 _osname = platform.system()
 _logger = logging.getLogger("tnz.zti")